@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Indexed single-file archives for the data shipped with Babel.
+
+An archive packs many independently encoded records into one file, followed by
+an index of their offsets. Readers memory-map the file, so processes that use
+the same archive share its pages in the operating system's page cache, and
+only the records that are actually requested get decoded.
+
+The layout of an archive file is::
+
+  header | record | record | ... | index
+
+where the fixed-size header holds a magic string, the format version and the
+position of the index, and the index is a `marshal`-encoded tuple of the
+``{key: (offset, length)}`` record mapping and a dictionary of metadata.
+
+The records are encoded by one of several backends (see `get_backend`), the
+name of which is stored in the metadata:
+
+ * ``pickle``: the `pickle` module, with a configurable protocol
+ * ``marshal``: the `marshal` module, which is fast but specific to the
+   version of Python that wrote the archive
+ * ``binary``: a compact encoding implemented in this module
+
+Only the ``pickle`` backend can execute code from the archive while decoding
+it; the other backends only ever create the types of objects found in the
+locale data.
+"""
+
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from babel.compat import b, u, pickle, text_type, integer_types
+
+__all__ = ['Archive', 'write_archive', 'get_backend']
+__docformat__ = 'restructuredtext en'
+
+MAGIC = b('BABELARC')
+VERSION = 1
+
+_header = struct.Struct('<8sHQQ')
+
+
+class Archive(object):
+    """Read-only access to the records of an archive file.
+
+    Records are decoded on every call to `load`; callers are expected to cache
+    the results as needed.
+    """
+
+    def __init__(self, filename):
+        """Open the archive.
+
+        :param filename: the path of the archive file
+        :raise `IOError`: if the file does not exist or cannot be read
+        :raise `ValueError`: if the file is not an archive in a supported
+                             format
+        """
+        self.filename = filename
+        fileobj = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(fileobj.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        finally:
+            fileobj.close()
+        if len(self._map) < _header.size:
+            raise ValueError('%r is not a data archive' % filename)
+        magic, version, offset, length = _header.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError('%r is not a data archive' % filename)
+        if version != VERSION:
+            raise ValueError('unsupported archive version %d in %r' %
+                             (version, filename))
+        index = self._map[offset:offset + length]
+        self.index, self.meta = marshal.loads(index)
+        self.backend = get_backend(self.meta.get('backend', 'pickle'))
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.filename)
+
+    def keys(self):
+        """Return the keys of all records in the archive.
+
+        :rtype: `list`
+        """
+        return list(self.index.keys())
+
+    def read(self, key):
+        """Return the encoded bytes of the record stored under `key`.
+
+        :param key: the record key
+        :rtype: `bytes`
+        :raise `KeyError`: if the archive has no such record
+        """
+        offset, length = self.index[key]
+        return self._map[offset:offset + length]
+
+    def load(self, key):
+        """Decode and return the record stored under `key`.
+
+        :param key: the record key
+        :raise `KeyError`: if the archive has no such record
+        """
+        return self.backend.loads(self.read(key))
+
+    def close(self):
+        """Unmap the archive file."""
+        self._map.close()
+
+
+def write_archive(filename, records, meta=None, backend=None):
+    """Write an archive file.
+
+    The file is first written under a temporary name and then moved into
+    place, so that processes reading an existing archive never see a
+    partially written file.
+
+    :param filename: the path of the archive file to create
+    :param records: an iterable of ``(key, value)`` tuples; keys must be
+                    strings, values anything the backend can encode
+    :param meta: a dictionary of additional metadata to store in the index;
+                 only builtin types supported by `marshal` may be used
+    :param backend: the backend encoding the records, or its name; defaults
+                    to ``pickle``
+    """
+    if backend is None or isinstance(backend, str):
+        backend = get_backend(backend or 'pickle')
+    meta = dict(meta or {})
+    meta['backend'] = backend.name
+    index = {}
+    tmpname = '%s.%d.tmp' % (filename, os.getpid())
+    fileobj = open(tmpname, 'wb')
+    try:
+        try:
+            fileobj.write(_header.pack(MAGIC, VERSION, 0, 0))
+            offset = _header.size
+            for key, value in records:
+                data = backend.dumps(value)
+                fileobj.write(data)
+                index[key] = (offset, len(data))
+                offset += len(data)
+            data = marshal.dumps((index, meta))
+            fileobj.write(data)
+            fileobj.seek(0)
+            fileobj.write(_header.pack(MAGIC, VERSION, offset, len(data)))
+        finally:
+            fileobj.close()
+        _replace(tmpname, filename)
+    except:
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+        raise
+
+
+def _replace(src, dst):
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if os.path.exists(dst):
+            # os.rename() does not replace existing files on Windows
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+class PickleBackend(object):
+    """Encodes records with the `pickle` module."""
+
+    name = 'pickle'
+
+    def __init__(self, protocol=2):
+        """Create the backend.
+
+        :param protocol: the pickle protocol to write records with
+        """
+        self.protocol = protocol
+
+    def dumps(self, value):
+        return pickle.dumps(value, self.protocol)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+# Objects other than the builtin types, by the names they are encoded under;
+# the classes are imported the first time they are needed
+_classes = {
+    'Alias': ('babel.localedata', 'Alias'),
+    'DateTimePattern': ('babel.dates', 'DateTimePattern'),
+    'NumberPattern': ('babel.numbers', 'NumberPattern'),
+    'PluralRule': ('babel.plural', 'PluralRule'),
+}
+_resolved_classes = {}
+
+def _class_name(obj):
+    cls = type(obj)
+    name = cls.__name__
+    if _classes.get(name) != (cls.__module__, name):
+        raise TypeError('cannot encode objects of type %r' % cls)
+    return name
+
+def _get_class(name):
+    cls = _resolved_classes.get(name)
+    if cls is None:
+        try:
+            module, attr = _classes[name]
+        except KeyError:
+            raise ValueError('unknown type %r in archive record' % name)
+        __import__(module)
+        cls = _resolved_classes[name] = getattr(sys.modules[module], attr)
+    return cls
+
+def _has_state(obj):
+    return hasattr(obj, '__dict__') or hasattr(type(obj), '__setstate__')
+
+def _get_state(obj):
+    # classes with __slots__ (such as `PluralRule`) define how they are
+    # pickled, everything else is stored with its instance dictionary
+    if hasattr(type(obj), '__setstate__'):
+        return obj.__getstate__()
+    return obj.__dict__
+
+def _restore(name, state):
+    cls = _get_class(name)
+    obj = cls.__new__(cls)
+    if hasattr(cls, '__setstate__'):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    return obj
+
+
+class MarshalBackend(object):
+    """Encodes records with the `marshal` module.
+
+    Objects that `marshal` does not support are stored as lists starting with
+    the name of their class, followed by their state; real lists are
+    stored with an empty name. Records that contain neither are decoded by
+    `marshal` alone.
+    """
+
+    name = 'marshal'
+
+    def dumps(self, value):
+        converted = []
+        value = self._convert(value, converted)
+        return (converted and b('T') or b('P')) + marshal.dumps(value)
+
+    def loads(self, data):
+        value = marshal.loads(data[1:])
+        if data[:1] == b('T'):
+            value = self._restore(value)
+        return value
+
+    def _convert(self, value, converted):
+        if type(value) is dict:
+            return dict([(key, self._convert(item, converted))
+                         for key, item in value.items()])
+        elif type(value) is tuple:
+            return tuple([self._convert(item, converted) for item in value])
+        elif type(value) is list:
+            converted.append(value)
+            return [''] + [self._convert(item, converted) for item in value]
+        elif _has_state(value):
+            converted.append(value)
+            return [_class_name(value),
+                    self._convert(_get_state(value), converted)]
+        return value
+
+    def _restore(self, value):
+        if type(value) is dict:
+            for key, item in value.items():
+                if type(item) in (dict, tuple, list):
+                    value[key] = self._restore(item)
+            return value
+        elif type(value) is tuple:
+            return tuple([self._restore(item) for item in value])
+        elif type(value) is list:
+            if value[0]:
+                return _restore(value[0], self._restore(value[1]))
+            return [self._restore(item) for item in value[1:]]
+        return value
+
+
+class BinaryBackend(object):
+    """Encodes records in a compact binary format.
+
+    Every record starts with a table of the distinct strings it contains,
+    which are then referred to by their position in the table. Integers and
+    lengths are stored as variable-length integers of 7 bits per byte.
+    """
+
+    name = 'binary'
+
+    def dumps(self, value):
+        strings = {}
+        buf = bytearray()
+        self._write(value, buf, strings)
+        table = bytearray()
+        _write_varint(len(strings), table)
+        for string, idx in sorted(strings.items(), key=lambda item: item[1]):
+            if isinstance(string, tuple): # native string on Python 2
+                encoded = string[1]
+            else:
+                encoded = string.encode('utf-8')
+            _write_varint(len(encoded), table)
+            table.extend(encoded)
+        return bytes(table + buf)
+
+    def loads(self, data):
+        data = bytearray(data)
+        count, pos = _read_varint(data, 0)
+        strings = []
+        for idx in range(count):
+            length, pos = _read_varint(data, pos)
+            strings.append(data[pos:pos + length].decode('utf-8'))
+            pos += length
+        return self._read(data, pos, strings)[0]
+
+    def _string(self, string, strings):
+        idx = strings.get(string)
+        if idx is None:
+            idx = strings[string] = len(strings)
+        return idx
+
+    def _write(self, value, buf, strings):
+        if value is None:
+            buf.append(_NONE)
+        elif value is True:
+            buf.append(_TRUE)
+        elif value is False:
+            buf.append(_FALSE)
+        elif isinstance(value, text_type):
+            buf.append(_TEXT)
+            _write_varint(self._string(value, strings), buf)
+        elif isinstance(value, str): # native string on Python 2
+            buf.append(_STR)
+            _write_varint(self._string(('', value), strings), buf)
+        elif isinstance(value, integer_types):
+            buf.append(_INT)
+            _write_varint(value < 0 and (-value << 1) - 1 or value << 1, buf)
+        elif isinstance(value, float):
+            buf.append(_FLOAT)
+            buf.extend(_double.pack(value))
+        elif type(value) is dict:
+            buf.append(_DICT)
+            _write_varint(len(value), buf)
+            for key, item in value.items():
+                self._write(key, buf, strings)
+                self._write(item, buf, strings)
+        elif type(value) in (tuple, list):
+            buf.append(type(value) is tuple and _TUPLE or _LIST)
+            _write_varint(len(value), buf)
+            for item in value:
+                self._write(item, buf, strings)
+        elif _has_state(value):
+            buf.append(_OBJECT)
+            _write_varint(self._string(_class_name(value), strings), buf)
+            self._write(_get_state(value), buf, strings)
+        else:
+            raise TypeError('cannot encode objects of type %r' % type(value))
+
+    def _read(self, data, pos, strings):
+        tag = data[pos]
+        pos += 1
+        if tag == _TEXT:
+            idx, pos = _read_varint(data, pos)
+            return strings[idx], pos
+        elif tag == _DICT:
+            length, pos = _read_varint(data, pos)
+            read = self._read
+            value = {}
+            for idx in range(length):
+                key, pos = read(data, pos, strings)
+                value[key], pos = read(data, pos, strings)
+            return value, pos
+        elif tag == _STR:
+            idx, pos = _read_varint(data, pos)
+            return str(strings[idx]), pos
+        elif tag == _INT:
+            value, pos = _read_varint(data, pos)
+            if value & 1:
+                return -((value + 1) >> 1), pos
+            return value >> 1, pos
+        elif tag == _NONE:
+            return None, pos
+        elif tag == _TRUE:
+            return True, pos
+        elif tag == _FALSE:
+            return False, pos
+        elif tag == _TUPLE or tag == _LIST:
+            length, pos = _read_varint(data, pos)
+            items = []
+            for idx in range(length):
+                item, pos = self._read(data, pos, strings)
+                items.append(item)
+            if tag == _TUPLE:
+                return tuple(items), pos
+            return items, pos
+        elif tag == _FLOAT:
+            return _double.unpack_from(bytes(data[pos:pos + 8]))[0], pos + 8
+        elif tag == _OBJECT:
+            idx, pos = _read_varint(data, pos)
+            state, pos = self._read(data, pos, strings)
+            return _restore(strings[idx], state), pos
+        raise ValueError('invalid archive record')
+
+
+_NONE, _TRUE, _FALSE, _TEXT, _STR, _INT, _FLOAT, _DICT, _TUPLE, _LIST, \
+    _OBJECT = range(11)
+_double = struct.Struct('<d')
+
+def _write_varint(value, buf):
+    while value > 0x7f:
+        buf.append(value & 0x7f | 0x80)
+        value >>= 7
+    buf.append(value)
+
+def _read_varint(data, pos):
+    value = data[pos]
+    pos += 1
+    if value < 0x80:
+        return value, pos
+    value &= 0x7f
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+_backends = {
+    'pickle': PickleBackend,
+    'marshal': MarshalBackend,
+    'binary': BinaryBackend,
+}
+
+def get_backend(name, **options):
+    """Return the backend for encoding and decoding archive records with the
+    given name.
+
+    >>> backend = get_backend('binary')
+    >>> value = {'a': (1, -2, None), 'b': [u('x'), 1.5]}
+    >>> backend.loads(backend.dumps(value)) == value
+    True
+
+    :param name: the name of the backend, one of ``pickle``, ``marshal`` and
+                 ``binary``
+    :param options: options for the backend, such as the ``protocol`` of the
+                    ``pickle`` backend
+    :raise `ValueError`: if there is no backend with that name
+    :since: version 1.0
+    """
+    try:
+        cls = _backends[name]
+    except KeyError:
+        raise ValueError('unknown archive backend %r' % name)
+    return cls(**options)
@@ -36,6 +36,7 @@ if sys.version_info[0] < 3:
     from ConfigParser import RawConfigParser
     
     xrange = xrange
+    intern = intern
 
     from gettext import GNUTranslations
 else:
@@ -67,6 +68,7 @@ else:
     from configparser import RawConfigParser
 
     xrange = range
+    from sys import intern
 
     #import functools, traceback
     #sys.excepthook = functools.partial(traceback.print_exception, chain=False)
@@ -14,36 +14,77 @@
 """Core locale representation and locale data access."""
 
 import os
-from babel.compat import pickle, string_types, u
+import weakref
+
+from babel.compat import pickle, string_types, threading, u
 
 from babel import localedata
+from babel.archive import Archive, write_archive
 
-__all__ = ['UnknownLocaleError', 'Locale', 'default_locale', 'negotiate_locale',
+__all__ = ['UnknownLocaleError', 'Locale', 'LocaleNegotiator',
+           'default_locale', 'negotiate_locale', 'parse_accept_language',
            'parse_locale']
 __docformat__ = 'restructuredtext en'
 
 _global_data = None
+# key -> table, for the tables loaded from the global data archive
+_global_segments = {}
+_global_lock = threading.Lock()
+_global_dirname = os.path.dirname(__file__)
+_global_archive = None
+
+def _get_global_archive():
+    """Return the `Archive` holding the global data, or `False` if the data
+    is stored in a single pickle file.
+    """
+    global _global_archive
+    if _global_archive is None:
+        _global_lock.acquire()
+        try:
+            if _global_archive is None:
+                filename = os.path.join(_global_dirname, 'global.arc')
+                if os.path.isfile(filename):
+                    _global_archive = Archive(filename)
+                else:
+                    _global_archive = False
+        finally:
+            _global_lock.release()
+    return _global_archive
 
 def get_global(key):
     """Return the dictionary for the given key in the global data.
     
-    The global data is stored in the ``babel/global.dat`` file and contains
-    information independent of individual locales.
+    The global data is stored in the ``babel/global.arc`` archive (or the
+    ``babel/global.dat`` file) and contains information independent of
+    individual locales.
     
     >>> get_global('zone_aliases')['UTC'] == 'Etc/GMT'
     True
     >>> get_global('zone_territories')['Europe/Berlin'] == 'DE'
     True
     
+    With the archive, every key is stored as a separate record, which is only
+    loaded the first time it is requested.
+    
     :param key: the data key
     :return: the dictionary found in the global data under the given key
     :rtype: `dict`
     :since: version 0.9
     """
+    data = _global_segments.get(key)
+    if data is not None:
+        return data
+    archive = _get_global_archive()
+    if archive:
+        if key in archive:
+            data = archive.load(key)
+        else:
+            data = {}
+        return _global_segments.setdefault(key, data)
+
     global _global_data
     if _global_data is None:
-        dirname = os.path.join(os.path.dirname(__file__))
-        filename = os.path.join(dirname, 'global.dat')
+        filename = os.path.join(_global_dirname, 'global.dat')
         fileobj = open(filename, 'rb')
         try:
             _global_data = pickle.load(fileobj)
@@ -51,6 +92,30 @@ def get_global(key):
             fileobj.close()
     return _global_data.get(key, {})
 
+def build_global_archive(filename=None, datfile=None, backend=None):
+    """Split the global data file into an archive with one record per key,
+    which `get_global` then loads independently of each other.
+    
+    :param filename: the path of the archive to write; defaults to the
+                     location `get_global` looks for
+    :param datfile: the path of the global data file to split; defaults to
+                    the ``global.dat`` file of the package
+    :param backend: the backend encoding the records, or its name (see
+                    `babel.archive.get_backend`); defaults to ``pickle``
+    :since: version 1.0
+    """
+    if filename is None:
+        filename = os.path.join(_global_dirname, 'global.arc')
+    if datfile is None:
+        datfile = os.path.join(_global_dirname, 'global.dat')
+    fileobj = open(datfile, 'rb')
+    try:
+        data = pickle.load(fileobj)
+    finally:
+        fileobj.close()
+    write_archive(filename, sorted(data.items()), meta={'type': 'global'},
+                  backend=backend)
+
 
 LOCALE_ALIASES = {
     'ar': 'ar_SY', 'bg': 'bg_BG', 'bs': 'bs_BA', 'ca': 'ca_ES', 'cs': 'cs_CZ', 
@@ -105,8 +170,14 @@ class Locale(object):
     :see: `IETF RFC 3066 <http://www.ietf.org/rfc/rfc3066.txt>`_
     """
 
-    def __init__(self, language, territory=None, script=None, variant=None):
-        """Initialize the locale object from the given identifier components.
+    __slots__ = ('language', 'territory', 'script', 'variant', '_identifier',
+                 '_view', '__weakref__')
+
+    _instances = {}
+    _parsed = {}
+
+    def __new__(cls, language, territory=None, script=None, variant=None):
+        """Return the locale object for the given identifier components.
         
         >>> locale = Locale('en', 'US')
         >>> locale.language
@@ -114,6 +185,12 @@ class Locale(object):
         >>> locale.territory
         'US'
         
+        Locale objects are immutable, and only one instance is ever created
+        for any combination of identifier components:
+        
+        >>> Locale('en', 'US') is locale
+        True
+        
         :param language: the language code
         :param territory: the territory (country or region) code
         :param script: the script code
@@ -121,15 +198,31 @@ class Locale(object):
         :raise `UnknownLocaleError`: if no locale data is available for the
                                      requested locale
         """
-        self.language = language
-        self.territory = territory
-        self.script = script
-        self.variant = variant
-        self.__data = None
+        key = (cls, language, territory, script, variant)
+        self = cls._instances.get(key)
+        if self is not None:
+            return self
+        self = object.__new__(cls)
+        object.__setattr__(self, 'language', language)
+        object.__setattr__(self, 'territory', territory)
+        object.__setattr__(self, 'script', script)
+        object.__setattr__(self, 'variant', variant)
+        identifier = '_'.join([_f for _f in [language, script, territory,
+                                             variant] if _f])
+        object.__setattr__(self, '_identifier', identifier)
+        object.__setattr__(self, '_view', None)
 
-        identifier = str(self)
         if not localedata.exists(identifier):
             raise UnknownLocaleError(identifier)
+        # another thread may have created the same locale in the meantime
+        return cls._instances.setdefault(key, self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s objects are immutable' % type(self).__name__)
+
+    def __reduce__(self):
+        return (type(self), (self.language, self.territory, self.script,
+                             self.variant))
 
     def default(cls, category=None, aliases=LOCALE_ALIASES):
         """Return the system default locale for the specified category.
@@ -193,6 +286,12 @@ class Locale(object):
         >>> Locale.parse(l)
         <Locale "de_DE">
         
+        Parsing the same identifier again returns the same object, without
+        parsing the string a second time:
+        
+        >>> Locale.parse('de-DE', sep='-') is l
+        True
+        
         :param identifier: the locale identifier string
         :param sep: optional component separator
         :return: a corresponding `Locale` instance
@@ -203,28 +302,90 @@ class Locale(object):
                                      requested locale
         :see: `parse_locale`
         """
+        if isinstance(identifier, DefaultLocale):
+            identifier = identifier.resolve()
         if isinstance(identifier, string_types):
-            return cls(*parse_locale(identifier, sep=sep))
+            key = (cls, identifier, sep)
+            locale = cls._parsed.get(key)
+            if locale is None:
+                locale = cls(*parse_locale(identifier, sep=sep))
+                if len(cls._parsed) >= 1000:
+                    # the identifiers may come from user input, don't let
+                    # arbitrary variations of them grow the memo unbounded
+                    cls._parsed.clear()
+                cls._parsed[key] = locale
+            return locale
         return identifier
     parse = classmethod(parse)
 
+    def aparse(cls, identifier, sep='_'):
+        """Create a `Locale` instance for the given locale identifier, and load
+        its locale data, without blocking the `asyncio` event loop::
+        
+          locale = await Locale.aparse('pt_BR')
+        
+        Parsing the identifier and loading the data happens in the default
+        executor of the running event loop, and concurrent requests for the
+        same identifier share a single job in the executor. This requires
+        Python 3.4 or later.
+        
+        :param identifier: the locale identifier string
+        :param sep: optional component separator
+        :return: a future for the corresponding `Locale` instance
+        :see: `parse`, `localedata.aload`
+        :since: version 1.0
+        """
+        if isinstance(identifier, Locale):
+            locale = identifier
+        else:
+            locale = cls._parsed.get((cls, identifier, sep))
+        if locale is not None and locale._identifier in localedata._cache:
+            return localedata._async_result(locale)
+        return localedata._async_call(('parse', cls, identifier, sep),
+                                      cls._load, identifier, sep)
+    aparse = classmethod(aparse)
+
+    def _load(cls, identifier, sep):
+        locale = cls.parse(identifier, sep=sep)
+        localedata.load_resolved(locale._identifier)
+        return locale
+    _load = classmethod(_load)
+
     def __eq__(self, other):
-        return str(self) == str(other)
+        if self is other:
+            return True
+        if isinstance(other, Locale):
+            return self._identifier == other._identifier
+        return self._identifier == str(other)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        # consistent with the comparison to identifier strings in __eq__
+        return hash(self._identifier)
+
     def __repr__(self):
-        return '<Locale "%s">' % str(self)
+        return '<Locale "%s">' % self._identifier
 
     def __str__(self):
-        return '_'.join([_f for _f in [self.language, self.script,
-                                      self.territory, self.variant] if _f])
+        return self._identifier
 
     def _data(self):
-        if self.__data is None:
-            self.__data = localedata.LocaleDataDict(localedata.load(str(self)))
-        return self.__data
+        # The (immortal) locale object only keeps a weak reference to its
+        # data, so that the data can still be evicted from the locale data
+        # cache, after which it is loaded again on the next access
+        ref = self._view
+        if ref is not None:
+            view = ref()
+            if view is not None:
+                return view
+        view = localedata.load_resolved(self._identifier)
+        try:
+            object.__setattr__(self, '_view', weakref.ref(view))
+        except TypeError: # not weakly referenceable
+            pass
+        return view
     _data = property(_data)
 
     def get_display_name(self, locale=None):
@@ -660,6 +821,73 @@ def default_locale(category=None, aliases=LOCALE_ALIASES):
             except ValueError:
                 pass
 
+
+class DefaultLocale(object):
+    """Placeholder for the system default locale of a category, for use as the
+    default value of ``locale`` parameters.
+
+    Unlike calling `default_locale` when a module is imported, the environment
+    is only consulted the first time the default locale is actually needed:
+    
+    >>> os.environ['LC_NUMERIC'] = 'de_DE.UTF-8'
+    >>> lc_numeric = DefaultLocale('LC_NUMERIC')
+    >>> lc_numeric
+    <DefaultLocale 'LC_NUMERIC'>
+    >>> Locale.parse(lc_numeric)
+    <Locale "de_DE">
+    
+    The value is looked up only once, later changes to the environment are
+    not taken into account:
+    
+    >>> os.environ['LC_NUMERIC'] = 'fr_FR.UTF-8'
+    >>> str(lc_numeric)
+    'de_DE'
+    
+    :since: version 1.0
+    """
+
+    def __init__(self, category, aliases=LOCALE_ALIASES):
+        """Create the placeholder.
+        
+        :param category: one of the ``LC_XXX`` environment variable names
+        :param aliases: a dictionary of aliases for locale identifiers
+        """
+        self.category = category
+        self.aliases = aliases
+        self._resolved = False
+        self._identifier = None
+
+    def resolve(self):
+        """Return the default locale identifier of the category.
+        
+        :return: the locale identifier, or `None` if no default locale is set
+                 in the environment
+        :rtype: `str`
+        :see: `default_locale`
+        """
+        if not self._resolved:
+            self._identifier = default_locale(self.category, self.aliases)
+            self._resolved = True
+        return self._identifier
+
+    def __eq__(self, other):
+        if isinstance(other, DefaultLocale):
+            other = other.resolve()
+        return self.resolve() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.resolve())
+
+    def __repr__(self):
+        return '<DefaultLocale %r>' % self.category
+
+    def __str__(self):
+        return str(self.resolve())
+
+
 def negotiate_locale(preferred, available, sep='_', aliases=LOCALE_ALIASES):
     """Find the best match between available and requested locale strings.
     
@@ -708,12 +936,27 @@ def negotiate_locale(preferred, available, sep='_', aliases=LOCALE_ALIASES):
     :return: the locale identifier for the best match, or `None` if no match
              was found
     :rtype: `str`
+    :see: `LocaleNegotiator` for negotiating repeatedly against the same
+          available locales
     """
+    # for a single negotiation, building a set of the available locales costs
+    # more than it saves over scanning the list for the few preferences
     available = [a.lower() for a in available if a]
+    return _negotiate(preferred, available, sep, aliases)
+
+def _negotiate(preferred, available, sep, aliases, wildcard=None):
+    """Return the first of the preferred locale strings that matches one of
+    the available locales, given as a list or set of lowercase locale strings.
+
+    The ``*`` wildcard only matches if `wildcard` is given, which is then
+    returned for it.
+    """
     for locale in preferred:
         ll = locale.lower()
         if ll in available:
             return locale
+        if wildcard is not None and locale == '*':
+            return wildcard
         if aliases:
             alias = aliases.get(ll)
             if alias:
@@ -725,6 +968,175 @@ def negotiate_locale(preferred, available, sep='_', aliases=LOCALE_ALIASES):
             return parts[0]
     return None
 
+
+class LocaleNegotiator(object):
+    """Negotiates locales against a fixed list of available locales.
+    
+    This implements the same matching as `negotiate_locale`, but the lookup
+    tables for the available locales are built only once, so that matching a
+    preferred locale takes constant time. The results for recently negotiated
+    lists of preferred locales are also remembered.
+    
+    Unlike `negotiate_locale`, the negotiator also understands the ``*``
+    wildcard of the ``Accept-Language`` header (see `parse_accept_language`),
+    which matches the first available locale.
+    
+    >>> negotiator = LocaleNegotiator(['de_DE', 'de_AT', 'ja_JP', 'nb_NO'])
+    >>> negotiator.negotiate(['de_de', 'en_US'])
+    'de_de'
+    >>> negotiator.negotiate(['ja', 'no'])
+    'ja_JP'
+    >>> negotiator.negotiate(['en_US'])
+    >>> negotiator.get_locale(['no', 'de'])
+    <Locale "nb_NO">
+    
+    :since: version 1.0
+    """
+
+    #: the number of lists of preferred locales whose results are remembered
+    cache_size = 1000
+
+    def __init__(self, available, sep='_', aliases=LOCALE_ALIASES):
+        """Create the negotiator.
+        
+        :param available: the list of locale strings available
+        :param sep: character that separates the different parts of the locale
+                    strings
+        :param aliases: a dictionary of aliases for locale identifiers
+        """
+        self.available = [a for a in available if a]
+        self.sep = sep
+        self.aliases = aliases
+        self._available = frozenset([a.lower() for a in self.available])
+        # only the aliases that lead to an available locale are of interest
+        self._aliases = {}
+        for name, alias in (aliases or {}).items():
+            alias = alias.replace('_', sep)
+            if alias.lower() in self._available:
+                self._aliases[name] = alias
+        self._cache = {}
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.available)
+
+    def negotiate(self, preferred):
+        """Find the best match between the available locales and the given
+        preferred locale strings.
+        
+        :param preferred: the list of locale strings preferred by the user
+        :return: the locale identifier for the best match, or `None` if no
+                 match was found
+        :rtype: `str`
+        :see: `negotiate_locale`
+        """
+        key = tuple(preferred)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        result = self._negotiate(key)
+        if len(self._cache) >= self.cache_size:
+            # the preferences usually come from the user, don't let arbitrary
+            # variations of them grow the cache unbounded
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+    def get_locale(self, preferred):
+        """Find the best match between the available locales and the given
+        preferred locale strings, and return it as a `Locale` object.
+        
+        :param preferred: the list of locale strings preferred by the user
+        :return: the `Locale` object for the best match, or `None` if no match
+                 was found
+        :rtype: `Locale`
+        :see: `Locale.negotiate`
+        """
+        identifier = self.negotiate(preferred)
+        if identifier:
+            return Locale.parse(identifier, sep=self.sep)
+
+    def _negotiate(self, preferred):
+        # the wildcard of the Accept-Language header matches anything
+        wildcard = self.available and self.available[0] or None
+        return _negotiate(preferred, self._available, self.sep, self._aliases,
+                          wildcard=wildcard)
+
+
+_accept_language_cache = {}
+
+def parse_accept_language(header, sep='_'):
+    """Parse the value of an HTTP ``Accept-Language`` header into a list of
+    locale identifiers, ordered by preference, as expected by
+    `negotiate_locale` and `LocaleNegotiator`.
+    
+    >>> parse_accept_language('de-CH, en-us;q=0.8, de;q=0.9, fr;q=0')
+    ['de_CH', 'de', 'en_US']
+    >>> negotiate_locale(parse_accept_language('da, en-gb;q=0.8'),
+    ...                  ['en_GB', 'de_DE'])
+    'en_GB'
+    
+    Language ranges with a quality value of zero are dropped, and the ``*``
+    wildcard is kept as is, which `LocaleNegotiator` understands as matching
+    any available locale:
+    
+    >>> parse_accept_language('fr, *;q=0.1', sep='-')
+    ['fr', '*']
+    >>> LocaleNegotiator(['en_US', 'de_DE']).negotiate(
+    ...     parse_accept_language('fr, *;q=0.1'))
+    'en_US'
+    
+    The results for recently seen headers are cached.
+    
+    :param header: the value of the ``Accept-Language`` header
+    :param sep: the character used to separate the parts of the returned
+                locale identifiers
+    :return: the list of locale identifiers
+    :rtype: `list`
+    :since: version 1.0
+    """
+    key = (header, sep)
+    try:
+        return list(_accept_language_cache[key])
+    except KeyError:
+        pass
+    ranges = []
+    for index, item in enumerate(header.split(',')):
+        params = item.split(';')
+        tag = params[0].strip()
+        if not tag:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            name, value = (param.split('=', 1) + [''])[:2]
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = None
+        if quality is None or not quality > 0:
+            continue
+        if tag != '*':
+            parts = tag.replace('-', '_').split('_')
+            parts[0] = parts[0].lower()
+            for idx, part in enumerate(parts[1:]):
+                if len(part) == 2:
+                    parts[idx + 1] = part.upper()
+                elif len(part) == 4:
+                    parts[idx + 1] = part.title()
+            tag = sep.join(parts)
+        ranges.append((-min(quality, 1.0), index, tag))
+    ranges.sort()
+    result = []
+    for quality, index, tag in ranges:
+        if tag not in result:
+            result.append(tag)
+    if len(_accept_language_cache) >= 1000:
+        # don't let arbitrary headers sent by clients grow the cache unbounded
+        _accept_language_cache.clear()
+    _accept_language_cache[key] = tuple(result)
+    return result
+
 def parse_locale(identifier, sep='_'):
     """Parse a locale identifier into a tuple of the form::
     
@@ -19,6 +19,8 @@ following environment variables, in that order:
  * ``LC_TIME``,
  * ``LC_ALL``, and
  * ``LANG``
+
+The variables are only read the first time the default locale is needed.
 """
 
 from __future__ import division
@@ -26,14 +28,14 @@ from datetime import date, datetime, time, timedelta
 import re
 
 from babel.compat import integer_types, u
-from babel.core import default_locale, get_global, Locale
+from babel.core import DefaultLocale, get_global, Locale
 from babel.util import UTC
 
 __all__ = ['format_date', 'format_datetime', 'format_time', 'format_timedelta',
            'get_timezone_name', 'parse_date', 'parse_datetime', 'parse_time']
 __docformat__ = 'restructuredtext en'
 
-LC_TIME = default_locale('LC_TIME')
+LC_TIME = DefaultLocale('LC_TIME')
 
 # Aliases for use in scopes where the modules are shadowed by local variables
 date_ = date
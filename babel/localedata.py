@@ -17,27 +17,104 @@
        more convenient interface for accessing the locale data.
 """
 
+from itertools import count
 import os
-from babel.compat import pickle, DictMixin, PY3, u, threading
 
-__all__ = ['exists', 'locale_identifiers', 'load']
+from babel.archive import Archive, write_archive
+from babel.compat import pickle, DictMixin, u, intern, text_type, \
+                         threading
+
+__all__ = ['exists', 'locale_identifiers', 'load', 'aload', 'preload']
 __docformat__ = 'restructuredtext en'
 
 _cache = {}
 _cache_lock = threading.RLock()
+# name -> [parent name, size, last access, number of cached child locales]
+_cache_entries = {}
+_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+_cache_clock = count()
+_cache_max_entries = None
+_cache_max_size = None
+# name -> event that is set when a locale being loaded has been published
+_loading = {}
+# name -> alias resolving view of the cached data, shared by all users
+_resolved = {}
+# (event loop, key) -> future of a pending executor job started by `aload`
+_async_jobs = {}
+# string -> the one instance of an equal string used by all loaded locales
+_strings = {}
+# size of the data evicted since `_strings` was last rebuilt, whose strings
+# may only be referenced by that table anymore
+_strings_evicted = 0
+_dedup_strings = False
+# functions called by `clear_cache`, which clear the caches of other modules
+# that hold values derived from the locale data
+_clear_hooks = []
 _dirname = os.path.join(os.path.dirname(__file__), 'localedata')
+_archive_filename = os.path.join(os.path.dirname(__file__), 'localedata.arc')
+_archive = None
+# locale identifier -> identifier of the parent locale, for the file layout
+_manifest = None
+
+
+def _get_archive():
+    """Return the `Archive` holding the locale data, or `False` if the data
+    is stored as one file per locale.
+    """
+    global _archive
+    if _archive is None:
+        _cache_lock.acquire()
+        try:
+            if _archive is None:
+                if os.path.isfile(_archive_filename):
+                    _archive = Archive(_archive_filename)
+                else:
+                    _archive = False
+        finally:
+            _cache_lock.release()
+    return _archive
+
+
+def _get_manifest():
+    """Return a dictionary mapping the identifiers of all available locales
+    to the identifiers of their parent locales.
+
+    With the archive, this is part of its index, which is generated along
+    with the archive. Otherwise the ``localedata`` directory is listed once,
+    and the result is kept until `clear_cache` is called.
+    """
+    global _manifest
+    archive = _get_archive()
+    if archive:
+        parents = archive.meta.get('parents')
+        if parents is None:
+            # archive written before parents were recorded in the index
+            parents = archive.meta['parents'] = dict([
+                (name, _parent(name)) for name in archive.meta['locales']
+            ])
+        return parents
+    manifest = _manifest
+    if manifest is None:
+        manifest = dict([
+            (stem, _parent(stem)) for stem, extension in [
+                os.path.splitext(filename) for filename in os.listdir(_dirname)
+            ] if extension == '.dat'
+        ])
+        _manifest = manifest
+    return manifest
 
 
 def exists(name):
     """Check whether locale data is available for the given locale.
     
+    This does not access the file system, except for locating the locale
+    data the first time it is needed.
+    
     :param name: the locale identifier string
     :return: `True` if the locale data exists, `False` otherwise
     :rtype: `bool`
     """
-    if name in _cache:
-        return True
-    return os.path.exists(os.path.join(_dirname, '%s.dat' % name))
+    return name in _cache or name in _get_manifest()
 
 
 def locale_identifiers():
@@ -48,9 +125,7 @@ def locale_identifiers():
     :rtype: `list`
     :since: version 0.8.1
     """
-    return [stem for stem, extension in [
-        os.path.splitext(filename) for filename in os.listdir(_dirname)
-    ] if extension == '.dat' and stem != 'root']
+    return [name for name in _get_manifest() if name != 'root']
 
 
 def load(name, merge_inherited=True):
@@ -65,7 +140,8 @@ def load(name, merge_inherited=True):
     True
     
     Note that the results are cached, and subsequent requests for the same
-    locale return the same dictionary:
+    locale return the same dictionary, unless the locale has been evicted from
+    the cache in the meantime (see `set_cache_limits`):
     
     >>> d1 = load('en_US')
     >>> d2 = load('en_US')
@@ -80,33 +156,682 @@ def load(name, merge_inherited=True):
     :raise `IOError`: if no locale data file is found for the given locale
                       identifer, or one of the locales it inherits from
     """
-    _cache_lock.acquire()
+    if not merge_inherited:
+        return _load(name, None)[0]
+    data = _cache.get(name)
+    if data is not None:
+        # Once published, locale data is read without taking any lock. The
+        # bookkeeping for the cache statistics and the eviction order is not
+        # synchronized either, so under heavy contention the numbers are
+        # approximate.
+        entry = _cache_entries.get(name)
+        if entry is not None:
+            entry[2] = next(_cache_clock)
+        _cache_stats['hits'] += 1
+        return data
+    return _load_cached(name)
+
+
+def _load_cached(name, pin=False):
+    """Load the locale data through the cache, taking the cache lock.
+
+    If several threads request the same locale that is not cached yet, only
+    one of them loads it, while the others wait for it to be published.
+
+    :param pin: whether to pin the cache entry of the locale, on behalf of
+                a child locale that is about to be loaded
+    """
+    while True:
+        _cache_lock.acquire()
+        try:
+            entry = _cache_entries.get(name)
+            if entry is not None:
+                _cache_stats['hits'] += 1
+                entry[2] = next(_cache_clock)
+                if pin:
+                    entry[3] += 1
+                return _cache[name]
+            event = _loading.get(name)
+            if event is None:
+                _cache_stats['misses'] += 1
+                event = _loading[name] = threading.Event()
+                break
+        finally:
+            _cache_lock.release()
+        # Another thread is loading the locale; once it is done, the data is
+        # either in the cache, or loading failed and we try for ourselves
+        event.wait()
+
     try:
-        data = _cache.get(name)
-        if not data:
-            # Load inherited data
-            if name == 'root' or not merge_inherited:
-                data = {}
-            else:
-                parts = name.split('_')
-                if len(parts) == 1:
-                    parent = 'root'
+        parent_name = _parent(name)
+        if parent_name is None:
+            parent = None
+        else:
+            parent = _load_cached(parent_name, pin=True)
+        try:
+            data, size = _load(name, parent)
+        except:
+            if parent_name is not None:
+                _cache_lock.acquire()
+                try:
+                    _unpin(parent_name)
+                finally:
+                    _cache_lock.release()
+            raise
+        _cache_lock.acquire()
+        try:
+            _cache[name] = data
+            _cache_entries[name] = [parent_name, size, next(_cache_clock),
+                                    pin and 1 or 0]
+            _cache_stats['size'] += size
+            _evict(keep=name)
+        finally:
+            _cache_lock.release()
+        return data
+    finally:
+        _cache_lock.acquire()
+        try:
+            del _loading[name]
+        finally:
+            _cache_lock.release()
+        event.set()
+
+
+def _parent(name):
+    """Return the identifier of the locale the given locale inherits from, or
+    `None` for the root locale.
+    """
+    manifest = _archive and _archive.meta.get('parents') or _manifest
+    if manifest and name in manifest:
+        return manifest[name]
+    if name == 'root':
+        return None
+    parts = name.split('_')
+    if len(parts) == 1:
+        return 'root'
+    return '_'.join(parts[:-1])
+
+
+def load_resolved(name):
+    """Load the locale data for the given locale, with all aliases resolved.
+
+    >>> d = load_resolved('en_US')
+    >>> d['months']['stand-alone']['wide'][1] == u('January')
+    True
+
+    If the locale data archive was built with aliases already resolved (see
+    `build_archive`), this is simply the data returned by `load`. Otherwise
+    the data is wrapped in a `LocaleDataDict`, which resolves aliases as they
+    are accessed. That view is kept alongside the cached data, so all `Locale`
+    objects for the same locale share the aliases it has already resolved:
+
+    >>> load_resolved('en_US') is d
+    True
+
+    :param name: the locale identifier string (or "root")
+    :return: the resolved locale data
+    :raise `IOError`: if no locale data file is found for the given locale
+                      identifer, or one of the locales it inherits from
+    :since: version 1.0
+    """
+    data = load(name)
+    archive = _get_archive()
+    if archive and archive.meta.get('resolved'):
+        return data
+    view = _resolved.get(name)
+    if view is None or view.data is not data:
+        view = LocaleDataDict(data)
+        _cache_lock.acquire()
+        try:
+            # Only keep the view if the data has not been evicted in the
+            # meantime, otherwise it would outlive the cache entry
+            if _cache.get(name) is data:
+                current = _resolved.get(name)
+                if current is not None and current.data is data:
+                    view = current
                 else:
-                    parent = '_'.join(parts[:-1])
-                data = load(parent).copy()
-            filename = os.path.join(_dirname, '%s.dat' % name)
-            fileobj = open(filename, 'rb')
+                    _resolved[name] = view
+        finally:
+            _cache_lock.release()
+    return view
+
+
+def aload(name):
+    """Load the locale data for the given locale without blocking the
+    `asyncio` event loop.
+
+    Reading and decoding the data happens in the default executor of the
+    running event loop, and the result is published to the same cache as
+    used by `load`. The returned future can be awaited; concurrent requests
+    for the same locale share a single job in the executor, and cancelling
+    one of them does not affect the others::
+
+      data = await aload('pt_BR')
+
+    This requires Python 3.4 or later.
+
+    :param name: the locale identifier string (or "root")
+    :return: a future for the locale data
+    :raise `IOError`: through the future, if no locale data file is found for
+                      the given locale identifer, or one of the locales it
+                      inherits from
+    :since: version 1.0
+    """
+    data = _cache.get(name)
+    if data is not None:
+        return _async_result(load(name))
+    return _async_call(('load', name), load, name)
+
+
+def _get_event_loop():
+    import asyncio
+    if hasattr(asyncio, 'get_running_loop'):
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+    return asyncio.get_event_loop()
+
+
+def _async_result(value):
+    """Return an already completed future with the given result."""
+    loop = _get_event_loop()
+    future = loop.create_future()
+    future.set_result(value)
+    return future
+
+
+def _async_call(key, func, *args):
+    """Call `func` in the default executor of the event loop, unless a call
+    with the same key is still pending, and return a future for the result.
+    """
+    import asyncio
+    loop = _get_event_loop()
+    job_key = (loop, key)
+    future = _async_jobs.get(job_key)
+    if future is None:
+        future = _async_jobs[job_key] = loop.run_in_executor(None, func,
+                                                             *args)
+        def _done(future):
+            _async_jobs.pop(job_key, None)
+        future.add_done_callback(_done)
+    # every caller gets a separate future, so that cancelling one of them
+    # does not cancel the shared job
+    return asyncio.shield(future)
+
+
+def preload(locales, sections=None):
+    """Load the data of the given locales into the cache ahead of time, with
+    all aliases resolved.
+
+    This is meant for servers that fork worker processes from a master
+    process: when the locales are preloaded before forking, every worker
+    starts with the data already in memory, and the memory stays shared
+    between the processes, as nothing is decoded or resolved lazily (and
+    thus written to) in the workers any more.
+
+    >>> clear_cache()
+    >>> preload(['de_AT', 'de_CH'], sections=['languages'])
+    >>> sorted(_cache)
+    ['de', 'de_AT', 'de_CH', 'root']
+    >>> d = load_resolved('de_AT')
+    >>> d['languages']['sv'] == u('Schwedisch')
+    True
+    >>> cache_info()['misses']
+    4
+    >>> clear_cache()
+
+    The locales are loaded in parallel by a pool of threads. Preloaded locales
+    are never evicted from the cache, even if a budget has been set with
+    `set_cache_limits`.
+
+    On Python 3.7 and later, calling `gc.freeze()` right before forking also
+    keeps the garbage collector from touching the preloaded objects. When many
+    locales are preloaded, enabling `set_string_dedup` beforehand also reduces
+    the memory they take.
+
+    :param locales: an iterable of locale identifier strings (or `Locale`
+                    objects)
+    :param sections: the names of the top-level sections (such as
+                     ``number_symbols``) to resolve, or `None` for all
+                     sections
+    :raise `IOError`: if no locale data file is found for one of the given
+                      locales, or one of the locales they inherit from
+    :since: version 1.0
+    """
+    names = []
+    for name in locales:
+        name = str(name)
+        if name not in names:
+            names.append(name)
+    if sections is not None:
+        sections = list(sections)
+
+    def _preload(name):
+        data = load_resolved(name)
+        for key in (sections is None and list(data.keys()) or sections):
+            if key in data:
+                _resolve_all(data[key])
+        _cache_lock.acquire()
+        try:
+            entry = _cache_entries.get(name)
+            if entry is not None:
+                # pinned on behalf of the caller, so it can never be evicted
+                entry[3] += 1
+        finally:
+            _cache_lock.release()
+
+    try:
+        from multiprocessing.pool import ThreadPool
+    except ImportError:
+        ThreadPool = None
+    if ThreadPool is None or len(names) < 2:
+        for name in names:
+            _preload(name)
+        return
+    pool = ThreadPool(min(len(names), 8))
+    try:
+        pool.map(_preload, names)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _resolve_all(data):
+    """Resolve every alias in the given (nested) locale data view, so that
+    later lookups no longer modify it.
+    """
+    if isinstance(data, LocaleDataDict):
+        for key in data.keys():
+            _resolve_all(data[key])
+
+
+def _load(name, parent):
+    """Load the data of a single locale, and merge it into the data of the
+    parent locale if given.
+
+    Return a ``(data, size)`` tuple, where the size is the number of bytes of
+    encoded data the locale itself contributes.
+    """
+    archive = _get_archive()
+    if archive:
+        try:
+            sections = archive.meta['locales'][name]
+        except KeyError:
+            raise IOError('no locale data for %r in %r' %
+                          (name, archive.filename))
+        size = 0
+        for section in sections:
+            size += archive.index[(name, section)][1]
+        return LazyLocaleData(name, sections, parent), size
+    fileobj = open(os.path.join(_dirname, '%s.dat' % name), 'rb')
+    try:
+        encoded = fileobj.read()
+    finally:
+        fileobj.close()
+    data = pickle.loads(encoded)
+    if _dedup_strings:
+        data = _dedup(data)
+    if parent is not None:
+        data = inherit(parent, data)
+    return data, len(encoded)
+
+
+def _dedup(value):
+    """Return the given freshly decoded locale data, with every string
+    replaced by one shared instance of an equal string.
+
+    Unpickling creates new string objects for every locale, even though much
+    of the text (territory and currency names, zone keys, patterns) is the
+    same in many locales. Dictionary keys that are native strings are
+    interned, which also speeds up lookups with string literals.
+    """
+    if type(value) is dict:
+        result = {}
+        for key, item in value.items():
+            if type(key) is str:
+                key = intern(key)
+            elif isinstance(key, text_type):
+                key = _strings.setdefault(key, key)
+            result[key] = _dedup(item)
+        return result
+    elif isinstance(value, text_type):
+        return _strings.setdefault(value, value)
+    elif type(value) is tuple:
+        return tuple([_dedup(item) for item in value])
+    elif type(value) is list:
+        return [_dedup(item) for item in value]
+    return value
+
+
+def _evict(keep=None):
+    """Evict the least recently used locales from the cache until it fits
+    into the configured budget again.
+
+    Locales that other cached locales inherit from are never evicted, and
+    neither is the locale named by `keep`.
+    """
+    while (_cache_max_entries is not None and
+           len(_cache) > _cache_max_entries) or \
+          (_cache_max_size is not None and
+           _cache_stats['size'] > _cache_max_size):
+        candidates = [(entry[2], name) for name, entry
+                      in _cache_entries.items()
+                      if entry[3] == 0 and name != keep]
+        if not candidates:
+            break
+        _remove(min(candidates)[1])
+        _cache_stats['evictions'] += 1
+    if _dedup_strings and _strings_evicted > _cache_stats['size']:
+        _rebuild_strings()
+
+
+def _remove(name):
+    global _strings_evicted
+    parent_name, size = _cache_entries.pop(name)[:2]
+    del _cache[name]
+    _resolved.pop(name, None)
+    _cache_stats['size'] -= size
+    _strings_evicted += size
+    if parent_name is not None:
+        _unpin(parent_name)
+
+
+def _rebuild_strings():
+    """Rebuild the table of shared strings from the data of the locales that
+    are still cached, so that the strings only used by evicted locales can be
+    freed.
+
+    This walks all cached data, and is therefore only done once more data has
+    been evicted than is still cached.
+    """
+    global _strings, _strings_evicted
+    strings = {}
+    seen = set()
+    def _collect(value):
+        if type(value) is dict:
+            if id(value) in seen:
+                # inherited data is shared between locales
+                return
+            seen.add(id(value))
+            for key, item in value.items():
+                # native string keys are interned instead, see `_dedup`
+                if type(key) is not str and isinstance(key, text_type):
+                    strings.setdefault(key, key)
+                _collect(item)
+        elif isinstance(value, text_type):
+            strings.setdefault(value, value)
+        elif type(value) in (tuple, list):
+            for item in value:
+                _collect(item)
+    for data in _cache.values():
+        if isinstance(data, LazyLocaleData):
+            # only the sections decoded so far hold strings
+            data = data.data
+        _collect(data)
+    _strings = strings
+    _strings_evicted = 0
+
+
+def _unpin(name):
+    entry = _cache_entries.get(name)
+    if entry is not None:
+        entry[3] -= 1
+
+
+def set_cache_limits(max_entries=None, max_size=None):
+    """Set the budget of the locale data cache.
+
+    By default the cache keeps the data of every locale that has been loaded.
+    With a budget set, the least recently used locales are evicted when the
+    cache grows beyond it. The data of a locale that other cached locales
+    inherit from (such as "root", or "de" while "de_DE" is cached) is never
+    evicted before the data of those locales, so the cache may temporarily
+    exceed the budget when it is smaller than a single inheritance chain.
+
+    >>> clear_cache()
+    >>> set_cache_limits(max_entries=3)
+    >>> for name in ('de_DE', 'de_AT', 'de_CH'):
+    ...     d = load(name)
+    >>> sorted(_cache)
+    ['de', 'de_CH', 'root']
+    >>> cache_info()['evictions']
+    2
+    >>> set_cache_limits()
+    >>> clear_cache()
+
+    :param max_entries: the maximum number of locales to keep, or `None` for
+                        no limit
+    :param max_size: the maximum total size of the cached locales, measured
+                     as the number of bytes of their encoded data, or `None`
+                     for no limit
+    :since: version 1.0
+    """
+    global _cache_max_entries, _cache_max_size
+    _cache_lock.acquire()
+    try:
+        _cache_max_entries = max_entries
+        _cache_max_size = max_size
+        _evict()
+    finally:
+        _cache_lock.release()
+
+
+def set_string_dedup(enabled=True):
+    """Enable or disable the deduplication of the strings in the locale data.
+
+    Much of the text in the locale data (such as territory and currency names,
+    time zone keys and patterns) is the same in many locales. With the
+    deduplication enabled, every string in newly loaded data is replaced with
+    one instance shared by all loaded locales, which saves about a sixth of
+    the memory used by the data of all locales. The extra pass over the data
+    makes loading a locale about 1.7 times slower though, so this is disabled
+    by default, and mainly pays off for processes that load (or `preload`)
+    most of the locales.
+
+    >>> clear_cache()
+    >>> set_string_dedup()
+    >>> load('de')['currency_symbols']['EUR'] is \\
+    ...     load('fr')['currency_symbols']['EUR']
+    True
+    >>> set_string_dedup(False)
+    >>> clear_cache()
+
+    The data of locales that are already cached is not affected.
+
+    :param enabled: whether the strings should be deduplicated
+    :since: version 1.0
+    """
+    global _dedup_strings
+    _cache_lock.acquire()
+    try:
+        _dedup_strings = enabled
+        if not enabled:
+            _strings.clear()
+    finally:
+        _cache_lock.release()
+
+
+def cache_info():
+    """Return statistics about the locale data cache.
+
+    >>> clear_cache()
+    >>> d = load('de_DE')
+    >>> d = load('de_DE')
+    >>> info = cache_info()
+    >>> info['entries'], info['hits'], info['misses']
+    (3, 1, 3)
+
+    :return: a dictionary with the number of cache ``hits``, ``misses`` and
+             ``evictions``, the number of cached ``entries`` and their total
+             ``size``, and the configured ``max_entries`` and ``max_size``
+    :rtype: `dict`
+    :since: version 1.0
+    """
+    _cache_lock.acquire()
+    try:
+        info = _cache_stats.copy()
+        info['entries'] = len(_cache)
+        info['max_entries'] = _cache_max_entries
+        info['max_size'] = _cache_max_size
+        return info
+    finally:
+        _cache_lock.release()
+
+
+def clear_cache():
+    """Remove all locales from the locale data cache, and reset its
+    statistics.
+
+    The list of available locales is read again the next time it is needed,
+    so this also picks up locale data files added in the meantime. The number
+    symbols and compiled patterns cached by `babel.numbers` are cleared as
+    well.
+
+    :since: version 1.0
+    """
+    global _manifest, _strings_evicted
+    _cache_lock.acquire()
+    try:
+        _manifest = None
+        _cache.clear()
+        _cache_entries.clear()
+        _resolved.clear()
+        _strings.clear()
+        _strings_evicted = 0
+        _cache_stats.update(hits=0, misses=0, evictions=0, size=0)
+    finally:
+        _cache_lock.release()
+    for hook in _clear_hooks:
+        hook()
+
+
+def build_archive(filename=None, dirname=None, resolve_aliases=False,
+                  backend=None):
+    """Pack the per-locale data files into a single archive file.
+
+    Once the archive exists next to the ``localedata`` directory, `load`
+    memory-maps it instead of opening one file per locale and parent locale.
+    Every top-level section of a locale (such as ``number_symbols`` or
+    ``time_zones``) is stored as a separate record, so that only the sections
+    that are actually accessed get decoded.
+
+    If `resolve_aliases` is true, all aliases are resolved when the archive is
+    built: every locale is stored as the difference between its fully
+    resolved data and that of its parent locale. The data loaded from such an
+    archive contains only plain values and dictionaries, so `load_resolved`
+    can return it without wrapping it in a `LocaleDataDict`.
+
+    :param filename: the path of the archive to write; defaults to the
+                     location the loader looks for
+    :param dirname: the directory containing the ``.dat`` files to pack;
+                    defaults to the ``localedata`` directory of the package
+    :param resolve_aliases: whether to resolve aliases at build time
+    :param backend: the backend encoding the records, or its name (see
+                    `babel.archive.get_backend`); defaults to ``pickle``
+    :raise `ValueError`: if aliases are resolved and the resolved data of a
+                         locale cannot be expressed as additions to that of
+                         its parent locale
+    :since: version 1.0
+    """
+    if filename is None:
+        filename = _archive_filename
+    if dirname is None:
+        dirname = _dirname
+    raw = {}
+    for stem, extension in [os.path.splitext(datfile)
+                            for datfile in os.listdir(dirname)]:
+        if extension == '.dat':
+            fileobj = open(os.path.join(dirname, stem + extension), 'rb')
             try:
-                if name != 'root' and merge_inherited:
-                    merge(data, pickle.load(fileobj))
-                else:
-                    data = pickle.load(fileobj)
-                _cache[name] = data
+                raw[stem] = pickle.load(fileobj)
             finally:
                 fileobj.close()
-        return data
-    finally:
-        _cache_lock.release()
+
+    if resolve_aliases:
+        merged = {}
+        resolved = {}
+        def _resolve(name):
+            if name not in resolved:
+                parent_name = _parent(name)
+                if parent_name is None:
+                    merged[name] = raw[name]
+                else:
+                    _resolve(parent_name)
+                    merged[name] = inherit(merged[parent_name], raw[name])
+                resolved[name] = _unwrap(LocaleDataDict(merged[name]))
+            return resolved[name]
+        data = {}
+        for name in raw:
+            parent_name = _parent(name)
+            if parent_name is None:
+                data[name] = _resolve(name)
+                continue
+            data[name] = _diff(_resolve(name), _resolve(parent_name))
+            if not _covers(resolved[name], resolved[parent_name]):
+                raise ValueError('cannot resolve aliases of %r at build time'
+                                 % name)
+    else:
+        data = raw
+
+    locales = {}
+    def _records():
+        for name in sorted(data):
+            locales[name] = tuple(sorted(data[name]))
+            for section in locales[name]:
+                yield (name, section), data[name][section]
+    parents = dict([(name, _parent(name)) for name in data])
+    write_archive(filename, _records(), meta={'type': 'localedata',
+                                              'locales': locales,
+                                              'parents': parents,
+                                              'resolved': resolve_aliases},
+                  backend=backend)
+
+
+def _unwrap(data):
+    """Turn a `LocaleDataDict` into nested plain dictionaries."""
+    result = {}
+    for key, value in data.items():
+        if isinstance(value, LocaleDataDict):
+            value = _unwrap(value)
+        result[key] = value
+    return result
+
+
+def _diff(data, base):
+    """Return the parts of `data` that differ from `base`, so that
+    ``inherit(base, _diff(data, base))`` is equal to `data`, provided that
+    ``_covers(data, base)``.
+    """
+    result = {}
+    for key, value in data.items():
+        if key in base:
+            base_value = base[key]
+            if isinstance(value, dict) and isinstance(base_value, dict):
+                value = _diff(value, base_value)
+                if not value:
+                    continue
+            elif value is base_value or (type(value) is type(base_value) and
+                                         value == base_value):
+                continue
+        result[key] = value
+    return result
+
+
+def _covers(data, base):
+    """Check whether every key in `base` is also present in `data`, at every
+    level of nested dictionaries that both have in common.
+    """
+    for key, base_value in base.items():
+        if key not in data:
+            return False
+        value = data[key]
+        if isinstance(value, dict) and isinstance(base_value, dict):
+            if not _covers(value, base_value):
+                return False
+        elif isinstance(value, dict) or isinstance(base_value, dict):
+            return False
+    return True
 
 
 def merge(dict1, dict2):
@@ -142,6 +867,66 @@ def merge(dict1, dict2):
             dict1[key] = val1
 
 
+def inherit(base, overrides):
+    """Return the data in `base` with the data in `overrides` merged into it.
+
+    The result is the same as that of merging `overrides` into a copy of
+    `base`, but `base` is neither copied nor modified where that can be
+    avoided: nested dictionaries that are not affected by the overrides are
+    shared between `base` and the result, and if nothing is overridden at all,
+    `base` itself is returned.
+
+    >>> base = {'x': {'a': 1, 'b': 2}, 'y': {'c': 3}}
+    >>> data = inherit(base, {'x': {'b': 12}, 'y': {}})
+    >>> sorted(data['x'].items())
+    [('a', 1), ('b', 12)]
+    >>> data['y'] is base['y']
+    True
+    >>> inherit(base, {'y': {'c': 3}}) is base
+    True
+
+    This way the memory used by a locale that inherits most of its data grows
+    with the number of values the locale actually overrides, rather than with
+    the size of the inherited data.
+
+    :param base: the inherited data
+    :param overrides: the data that should be merged into the inherited data
+    :return: the merged data
+    :rtype: `dict`
+    :since: version 1.0
+    """
+    changes = {}
+    for key, val2 in overrides.items():
+        if val2 is None:
+            continue
+        val1 = base.get(key)
+        if isinstance(val2, dict):
+            if isinstance(val1, Alias):
+                if not val2:
+                    continue
+                val2 = (val1, val2)
+            elif isinstance(val1, tuple):
+                alias, others = val1
+                others2 = inherit(others, val2)
+                if others2 is others:
+                    continue
+                val2 = (alias, others2)
+            elif val1 is None:
+                val2 = inherit({}, val2)
+            else:
+                val2 = inherit(val1, val2)
+                if val2 is val1:
+                    continue
+        elif val2 is val1 or (type(val2) is type(val1) and val2 == val1):
+            continue
+        changes[key] = val2
+    if not changes:
+        return base
+    data = base.copy()
+    data.update(changes)
+    return data
+
+
 class Alias(object):
     """Representation of an alias in the locale data.
     
@@ -175,21 +960,98 @@ class Alias(object):
         return data
 
 
-class LocaleDataDict(DictMixin, dict):
+class LazyLocaleData(DictMixin):
+    """The data of a locale stored in an archive, where every top-level
+    section is decoded, and merged with the data inherited from the parent
+    locale, the first time it is accessed.
+    """
+
+    def __init__(self, name, sections, parent=None):
+        """Create the lazy locale data.
+
+        :param name: the locale identifier string
+        :param sections: the names of the sections stored for the locale
+        :param parent: the (lazy) data of the parent locale, or `None` if no
+                       data should be inherited
+        """
+        self.data = {}
+        self.name = name
+        self.own_sections = frozenset(sections)
+        if parent is not None:
+            self.sections = self.own_sections.union(parent.keys())
+        else:
+            self.sections = self.own_sections
+        self.parent = parent
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.name)
+
+    def __contains__(self, key):
+        return key in self.sections
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __getitem__(self, key):
+        try:
+            return self.data[key]
+        except KeyError:
+            if key not in self.sections:
+                raise
+        if key not in self.own_sections:
+            value = self.parent[key]
+        else:
+            value = _get_archive().load((self.name, key))
+            if _dedup_strings:
+                value = _dedup(value)
+            if self.parent is not None and key in self.parent:
+                value = inherit({key: self.parent[key]}, {key: value})[key]
+        # another thread may have decoded the same section in the meantime,
+        # make sure everyone ends up using the same object
+        return self.data.setdefault(key, value)
+
+    def keys(self):
+        return list(self.sections)
+
+    def copy(self):
+        return dict([(key, self[key]) for key in self.sections])
+
+
+class LocaleDataDict(DictMixin):
     """Dictionary wrapper that automatically resolves aliases to the actual
     values.
+
+    The wrapped data is not copied; values are looked up in it the first time
+    they are accessed, so the sections of lazily loaded locale data are only
+    decoded when they are actually needed.
     """
 
     def __init__(self, data, base=None):
-        dict.__init__(self, data)
-        if PY3:
-          DictMixin.__init__(self, data)
+        self.data = data
         if base is None:
             base = data
         self.base = base
+        # key -> value with aliases resolved, for the keys accessed so far
+        self._resolved = {}
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
 
     def __getitem__(self, key):
-        orig = val = dict.__getitem__(self, key)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        val = self.data[key]
         if isinstance(val, Alias): # resolve an alias
             val = val.resolve(self.base)
         if isinstance(val, tuple): # Merge a partial dict with an alias
@@ -198,9 +1060,11 @@ class LocaleDataDict(DictMixin, dict):
             merge(val, others)
         if type(val) is dict: # Return a nested alias-resolving dict
             val = LocaleDataDict(val, base=self.base)
-        if val is not orig:
-            self[key] = val
-        return val
+        # make sure that concurrent lookups end up using the same object
+        return self._resolved.setdefault(key, val)
+
+    def keys(self):
+        return list(self.data.keys())
 
     def copy(self):
-        return LocaleDataDict(dict.copy(self), base=self.base)
+        return LocaleDataDict(self.data.copy(), base=self.base)
@@ -13,11 +13,11 @@
 
 """Plural form definitions."""
 
-from babel.core import default_locale, Locale
+from babel.core import DefaultLocale, Locale
 from operator import itemgetter
 
 
-LC_CTYPE = default_locale('LC_CTYPE')
+LC_CTYPE = DefaultLocale('LC_CTYPE')
 
 
 PLURALS = {
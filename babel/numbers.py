@@ -19,6 +19,8 @@ following environment variables, in that order:
  * ``LC_NUMERIC``,
  * ``LC_ALL``, and
  * ``LANG``
+
+The variables are only read the first time the default locale is needed.
 """
 # TODO:
 #  Padding and rounding increments in pattern:
@@ -26,16 +28,20 @@ following environment variables, in that order:
 from decimal import Decimal
 import math
 import re
+import sys
 
-from babel.compat import u, b, long_type, PY3, xrange
-from babel.core import default_locale, Locale
+from babel.compat import u, b, long_type, integer_types, threading
+from babel.core import DefaultLocale, Locale
+from babel import localedata
 
 __all__ = ['format_number', 'format_decimal', 'format_currency',
-           'format_percent', 'format_scientific', 'parse_number',
-           'parse_decimal', 'NumberFormatError']
+           'format_percent', 'format_scientific', 'format_decimal_many',
+           'format_currency_many', 'format_percent_many', 'parse_number',
+           'parse_decimal', 'compile_pattern', 'NumberFormatter',
+           'NumberFormatError']
 __docformat__ = 'restructuredtext en'
 
-LC_NUMERIC = default_locale('LC_NUMERIC')
+LC_NUMERIC = DefaultLocale('LC_NUMERIC')
 
 def get_currency_name(currency, locale=LC_NUMERIC):
     """Return the name used by the locale for the specified currency.
@@ -124,6 +130,29 @@ def get_group_symbol(locale=LC_NUMERIC):
     """
     return Locale.parse(locale).number_symbols.get('group', u(','))
 
+_symbols = {}
+
+def _get_symbols(locale):
+    """Return the number symbols of the locale that are used in formatting,
+    with the defaults filled in.
+
+    The symbols are looked up once per locale. As `Locale` objects compare and
+    hash equal to their identifier, both can be used as the key.
+    """
+    try:
+        return _symbols[locale]
+    except KeyError:
+        pass
+    locale = Locale.parse(locale)
+    symbols = locale.number_symbols
+    return _symbols.setdefault(locale, {
+        'decimal': symbols.get('decimal', u('.')),
+        'group': symbols.get('group', u(',')),
+        'plusSign': symbols.get('plusSign', u('+')),
+        'minusSign': symbols.get('minusSign', u('-')),
+        'exponential': symbols.get('exponential', u('E')),
+    })
+
 def format_number(number, locale=LC_NUMERIC):
     """Return the given number formatted for a specific locale.
     
@@ -250,6 +279,175 @@ def format_scientific(number, format=None, locale=LC_NUMERIC):
     return pattern.apply(number, locale)
 
 
+class NumberFormatter(object):
+    """Formats numbers for a single locale.
+
+    The number symbols and default patterns of the locale are looked up once
+    when the formatter is created, rather than on every call as the
+    ``format_*`` functions do, which makes a difference when many numbers are
+    formatted for the same locale:
+
+    >>> formatter = NumberFormatter('de_DE')
+    >>> formatter.decimal(12345.5) == u('12.345,5')
+    True
+    >>> formatter.currency(1099.98, 'EUR') == u('1.099,98\\xa0\\u20ac')
+    True
+    >>> formatter.percent(0.34) == u('34\\xa0%')
+    True
+    >>> formatter.scientific(10000) == u('1E4')
+    True
+
+    :since: version 1.0
+    """
+
+    def __init__(self, locale=LC_NUMERIC):
+        """Initialize the formatter.
+
+        :param locale: the `Locale` object or locale identifier
+        """
+        self.locale = Locale.parse(locale)
+        self.symbols = dict(_get_symbols(self.locale))
+        self.decimal_pattern = parse_pattern(
+            self.locale.decimal_formats.get(None))
+        self.currency_pattern = parse_pattern(
+            self.locale.currency_formats.get(None))
+        self.percent_pattern = parse_pattern(
+            self.locale.percent_formats.get(None))
+        self.scientific_pattern = parse_pattern(
+            self.locale.scientific_formats.get(None))
+        self._decimal = compile_pattern(self.decimal_pattern, self.locale)
+        self._currency = compile_pattern(self.currency_pattern, self.locale)
+        self._percent = compile_pattern(self.percent_pattern, self.locale)
+        self._scientific = compile_pattern(self.scientific_pattern,
+                                           self.locale)
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, str(self.locale))
+
+    def decimal(self, number, format=None):
+        """Return the given decimal number formatted for the locale.
+
+        :param number: the number to format
+        :param format: the format pattern, or `None` for the default decimal
+                       pattern of the locale
+        :rtype: `unicode`
+        :see: `format_decimal`
+        """
+        if format:
+            return compile_pattern(format, self.locale)(number)
+        return self._decimal(number)
+
+    def currency(self, number, currency, format=None):
+        """Return the given number formatted as an amount in the given
+        currency for the locale.
+
+        :param number: the number to format
+        :param currency: the currency code
+        :param format: the format pattern, or `None` for the default currency
+                       pattern of the locale
+        :rtype: `unicode`
+        :see: `format_currency`
+        """
+        if format:
+            return compile_pattern(format, self.locale)(number, currency)
+        return self._currency(number, currency)
+
+    def percent(self, number, format=None):
+        """Return the given number formatted as a percent value for the
+        locale.
+
+        :param number: the number to format
+        :param format: the format pattern, or `None` for the default percent
+                       pattern of the locale
+        :rtype: `unicode`
+        :see: `format_percent`
+        """
+        if format:
+            return compile_pattern(format, self.locale)(number)
+        return self._percent(number)
+
+    def scientific(self, number, format=None):
+        """Return the given number formatted in scientific notation for the
+        locale.
+
+        :param number: the number to format
+        :param format: the format pattern, or `None` for the default
+                       scientific pattern of the locale
+        :rtype: `unicode`
+        :see: `format_scientific`
+        """
+        if format:
+            return compile_pattern(format, self.locale)(number)
+        return self._scientific(number)
+
+
+def format_decimal_many(numbers, format=None, locale=LC_NUMERIC):
+    """Return the given decimal numbers formatted for a specific locale.
+
+    >>> format_decimal_many([1.2345, 12345.5, -1], locale='en_US') == [
+    ...     u('1.234'), u('12,345.5'), u('-1')]
+    True
+
+    The numbers can be any iterable, or a NumPy array, in which case the
+    result is a NumPy array of the same shape holding the formatted strings
+    (as objects). Every number is formatted the same way as `format_decimal`
+    formats it, but the locale and pattern are only looked up once, and the
+    digits of integer arrays are produced by NumPy.
+
+    :param numbers: the numbers to format
+    :param format: the format pattern, or `None` for the default decimal
+                   pattern of the locale
+    :param locale: the `Locale` object or locale identifier
+    :return: the formatted numbers
+    :rtype: `list`, or a NumPy array
+    :since: version 1.0
+    """
+    locale = Locale.parse(locale)
+    pattern = parse_pattern(format or locale.decimal_formats.get(None))
+    return pattern._apply_many(numbers, locale)
+
+def format_currency_many(numbers, currency, format=None, locale=LC_NUMERIC):
+    """Return the given numbers formatted as amounts in the given currency.
+
+    >>> format_currency_many([1099.98, -5], 'USD', locale='en_US') == [
+    ...     u('$1,099.98'), u('($5.00)')]
+    True
+
+    :param numbers: the numbers to format, any iterable or a NumPy array
+    :param currency: the currency code
+    :param format: the format pattern, or `None` for the default currency
+                   pattern of the locale
+    :param locale: the `Locale` object or locale identifier
+    :return: the formatted numbers
+    :rtype: `list`, or a NumPy array
+    :see: `format_decimal_many`
+    :since: version 1.0
+    """
+    locale = Locale.parse(locale)
+    pattern = parse_pattern(format or locale.currency_formats.get(None))
+    return pattern._apply_many(numbers, locale, currency)
+
+def format_percent_many(numbers, format=None, locale=LC_NUMERIC):
+    """Return the given numbers formatted as percent values.
+
+    >>> format_percent_many([0.34, 25.1234], locale='en_US') == [
+    ...     u('34%'), u('2,512%')]
+    True
+
+    :param numbers: the numbers to format, any iterable or a NumPy array
+    :param format: the format pattern, or `None` for the default percent
+                   pattern of the locale
+    :param locale: the `Locale` object or locale identifier
+    :return: the formatted numbers
+    :rtype: `list`, or a NumPy array
+    :see: `format_decimal_many`
+    :since: version 1.0
+    """
+    locale = Locale.parse(locale)
+    pattern = parse_pattern(format or locale.percent_formats.get(None))
+    return pattern._apply_many(numbers, locale)
+
+
 class NumberFormatError(ValueError):
     """Exception raised when a string cannot be parsed into a number."""
 
@@ -310,18 +508,95 @@ SUFFIX_PATTERN = r"(?P<suffix>.*)"
 number_re = re.compile(r"%s%s%s" % (PREFIX_PATTERN, NUMBER_PATTERN,
                                     SUFFIX_PATTERN))
 
-def split_number(value):
-    """Convert a number into a (intasstring, fractionasstring) tuple"""
+def _decompose(value):
+    """Return the sign, coefficient and exponent of a number, so that the
+    number is ``(-1) ** sign * coefficient * 10 ** exponent``.
+
+    Integers and `Decimal` objects are taken as they are. Floats are taken at
+    their shortest decimal representation (as given by `repr`) rather than
+    at their exact binary value, so that ``1.005`` is ``1005 * 10 ** -3``:
+
+    >>> _decompose(-1.005)
+    (1, 1005, -3)
+    >>> _decompose(Decimal('1.50'))
+    (0, 150, -2)
+    >>> _decompose(1e20)
+    (0, 1, 20)
+    """
+    if isinstance(value, integer_types):
+        if value < 0:
+            return 1, -value, 0
+        return 0, value, 0
     if isinstance(value, Decimal):
-        text = str(value)
+        sign, digits, exponent = value.as_tuple()
+        if not isinstance(exponent, integer_types):
+            raise ValueError('can not format %s' % value)
+        coefficient = 0
+        for digit in digits:
+            coefficient = coefficient * 10 + digit
+        return sign, coefficient, exponent
+    text = repr(float(value))
+    if 'e' in text:
+        text, exponent = text.split('e')
+        exponent = int(exponent)
     else:
-        text = ('%.9f' % value).rstrip('0')
+        exponent = 0
+    sign = int(text.startswith('-'))
+    if sign:
+        text = text[1:]
     if '.' in text:
-        a, b = text.split('.', 1)
-        if b == '0':
-            b = ''
-    else:
-        a, b = text, ''
+        text, fraction = text.split('.')
+        exponent -= len(fraction)
+        text += fraction
+    return sign, int(text), exponent
+
+def _digits(coefficient, exponent):
+    """Return the integer and fraction digits of ``coefficient * 10 **
+    exponent`` as strings, without trailing zeros in the fraction.
+    """
+    if exponent >= 0:
+        if not coefficient:
+            return '0', ''
+        return str(coefficient) + '0' * exponent, ''
+    digits = str(coefficient)
+    if len(digits) <= -exponent:
+        digits = '0' * (1 - exponent - len(digits)) + digits
+    return digits[:exponent], digits[exponent:].rstrip('0')
+
+def _round_digits(value, ndigits, scale=1):
+    """Round the absolute value of a number, multiplied by `scale`, to
+    `ndigits` fraction digits with the round-half-even algorithm, and return
+    its integer and fraction digits as strings.
+
+    The rounding is exact, as it is done on the integer coefficient of the
+    number:
+
+    >>> _round_digits(2.675, 2)
+    ('2', '68')
+    >>> _round_digits(-1.2345, 3)
+    ('1', '234')
+    >>> _round_digits(1234, -2)
+    ('1200', '')
+    >>> _round_digits(0.0345, 1, scale=100)
+    ('3', '4')
+    """
+    sign, coefficient, exponent = _decompose(value)
+    coefficient *= scale
+    if exponent < -ndigits:
+        shift = 10 ** (-ndigits - exponent)
+        coefficient, remainder = divmod(coefficient, shift)
+        remainder *= 2
+        if remainder > shift or (remainder == shift and coefficient & 1):
+            coefficient += 1
+        exponent = -ndigits
+    return _digits(coefficient, exponent)
+
+def split_number(value):
+    """Convert a number into a (intasstring, fractionasstring) tuple"""
+    sign, coefficient, exponent = _decompose(value)
+    a, b = _digits(coefficient, exponent)
+    if sign:
+        a = '-' + a
     return a, b
 
 def bankersround(value, ndigits=0):
@@ -339,36 +614,102 @@ def bankersround(value, ndigits=0):
     >>> bankersround(1234.0, -2)
     1200.0
     """
-    sign = int(value < 0) and -1 or 1
-    value = abs(value)
-    a, b = split_number(value)
-    digits = a + b
-    add = 0
-    i = len(a) + ndigits
-    if i < 0 or i >= len(digits):
-        pass
-    elif digits[i] > '5':
-        add = 1
-    elif digits[i] == '5' and digits[i-1] in '13579':
-        add = 1
-    elif digits[i] == '5':     # previous digit is even
-        # We round up unless all following digits are zero.
-        for j in xrange(i + 1, len(digits)):
-            if digits[j] != '0':
-                add = 1
-                break
-
-    scale = 10**ndigits
+    a, b = _round_digits(value, ndigits)
+    if b:
+        a = '%s.%s' % (a, b)
+    if value < 0:
+        a = '-' + a
     if isinstance(value, Decimal):
-        return Decimal(int(value * scale + add)) / scale * sign
-    else:
-        return float(int(value * scale + add)) / scale * sign
+        return Decimal(a)
+    return float(a)
+
+_pattern_cache = {}
+_pattern_cache_lock = threading.Lock()
+_pattern_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_pattern_cache_size = 1000
 
 def parse_pattern(pattern):
-    """Parse number format patterns"""
+    """Parse number format patterns.
+
+    The compiled patterns are cached by pattern string, so that formatting
+    with an explicit pattern does not parse the same pattern over and over
+    again:
+
+    >>> parse_pattern(u('#,##0.00')) is parse_pattern(u('#,##0.00'))
+    True
+
+    The cache holds at most `_pattern_cache_size` patterns; see
+    `pattern_cache_info`. The default patterns of a locale are already stored
+    compiled in the locale data, and are returned as they are.
+
+    :param pattern: the format pattern string, or a `NumberPattern`
+    :return: the compiled pattern
+    :rtype: `NumberPattern`
+    """
     if isinstance(pattern, NumberPattern):
         return pattern
+    _pattern_cache_lock.acquire()
+    try:
+        compiled = _pattern_cache.get(pattern)
+        if compiled is not None:
+            _pattern_cache_stats['hits'] += 1
+            return compiled
+    finally:
+        _pattern_cache_lock.release()
+    # parse outside of the lock, at worst a pattern is parsed twice
+    compiled = _parse_pattern(pattern)
+    _pattern_cache_lock.acquire()
+    try:
+        _pattern_cache_stats['misses'] += 1
+        if pattern not in _pattern_cache and \
+                len(_pattern_cache) >= _pattern_cache_size:
+            # patterns may come from user input, don't let arbitrary
+            # variations of them grow the cache unbounded
+            _pattern_cache_stats['evictions'] += len(_pattern_cache)
+            _pattern_cache.clear()
+        return _pattern_cache.setdefault(pattern, compiled)
+    finally:
+        _pattern_cache_lock.release()
 
+def pattern_cache_info():
+    """Return statistics about the cache of compiled number patterns.
+
+    >>> clear_pattern_cache()
+    >>> p = parse_pattern(u('#,##0.00'))
+    >>> p = parse_pattern(u('#,##0.00'))
+    >>> info = pattern_cache_info()
+    >>> info['entries'], info['hits'], info['misses']
+    (1, 1, 1)
+
+    :return: a dictionary with the number of cache ``hits``, ``misses`` and
+             ``evictions``, the number of cached ``entries``, and the
+             ``max_entries`` the cache holds
+    :rtype: `dict`
+    :since: version 1.0
+    """
+    _pattern_cache_lock.acquire()
+    try:
+        info = _pattern_cache_stats.copy()
+        info['entries'] = len(_pattern_cache)
+        info['max_entries'] = _pattern_cache_size
+        return info
+    finally:
+        _pattern_cache_lock.release()
+
+def clear_pattern_cache():
+    """Remove all compiled patterns from the pattern cache, and reset its
+    statistics.
+
+    :since: version 1.0
+    """
+    _pattern_cache_lock.acquire()
+    try:
+        _pattern_cache.clear()
+        _pattern_cache_stats.update(hits=0, misses=0, evictions=0)
+    finally:
+        _pattern_cache_lock.release()
+
+def _parse_pattern(pattern):
     # Do we have a negative subpattern?
     if ';' in pattern:
         pattern, neg_pattern = pattern.split(';', 1)
@@ -445,6 +786,174 @@ def parse_pattern(pattern):
                          exp_prec, exp_plus)
 
 
+_compiled = {}
+_compiled_size = 1000
+
+def _clear_locale_caches():
+    _symbols.clear()
+    _compiled.clear()
+
+localedata._clear_hooks.append(_clear_locale_caches)
+
+def compile_pattern(pattern, locale=LC_NUMERIC):
+    """Compile a number format pattern for a specific locale into a regular
+    Python function, which takes the number to format, and for currency
+    patterns also the currency code as second argument:
+
+    >>> func = compile_pattern(u('#,##0.00'), 'de_DE')
+    >>> func(1099.98) == u('1.099,98')
+    True
+    >>> func = compile_pattern(u('\\xa4#,##0.00;(\\xa4#,##0.00)'), 'en_US')
+    >>> func(-1099.98, 'USD') == u('($1,099.98)')
+    True
+
+    The symbols of the locale and everything the pattern says about grouping,
+    precision and the prefix and suffix are built into the function as
+    constants, so it only does the work that depends on the number. The
+    functions are cached per pattern and locale, until
+    `babel.localedata.clear_cache` is called.
+
+    :param pattern: the format pattern string, or a `NumberPattern`
+    :param locale: the `Locale` object or locale identifier
+    :return: a function that formats numbers the same way as
+             `NumberPattern.apply` does
+    :since: version 1.0
+    """
+    pattern = parse_pattern(pattern)
+    locale = Locale.parse(locale)
+    # the pattern string of a `NumberPattern` is only the positive pattern
+    key = (pattern.pattern, pattern.prefix, pattern.suffix, locale)
+    func = _compiled.get(key)
+    if func is None:
+        func = _compile(pattern, locale)
+        if len(_compiled) >= _compiled_size:
+            # patterns may come from user input, don't let arbitrary
+            # variations of them grow the cache unbounded
+            _compiled.clear()
+        func = _compiled.setdefault(key, func)
+    return func
+
+def _affix_source(affix):
+    """Return the Python expression for a prefix or suffix, with the currency
+    signs replaced by the currency code and symbol.
+    """
+    parts = []
+    for index, text in enumerate(affix.split(u('\xa4\xa4'))):
+        if index:
+            parts.append('code')
+        for index, text in enumerate(text.split(u('\xa4'))):
+            if index:
+                parts.append('symbol')
+            if text:
+                parts.append(repr(text))
+    return ' + '.join(parts) or repr(u(''))
+
+def _compile(pattern, locale):
+    symbols = _get_symbols(locale)
+    namespace = {
+        'INTEGER_TYPES': integer_types,
+        'PATTERN': pattern,
+        'SYMBOLS': symbols,
+        'round_digits': _round_digits,
+    }
+    affixes = pattern.prefix + pattern.suffix
+    currency = u('\xa4') in ''.join(affixes)
+    if currency:
+        # a copy, the functions are cached longer than the locale data may be
+        namespace['CURRENCY_SYMBOLS'] = dict(locale.currency_symbols.items())
+    if pattern.exp_prec or '@' in pattern.pattern:
+        # scientific and significant digits patterns are rare, they are
+        # left to the generic implementation
+        if currency:
+            source = [
+                'def format(value, currency=None):',
+                ' return PATTERN._apply(value, SYMBOLS, currency,',
+                '                       CURRENCY_SYMBOLS.get(currency, '
+                'currency))'
+            ]
+        else:
+            source = [
+                'def format(value, currency=None):',
+                ' return PATTERN._apply(value, SYMBOLS)'
+            ]
+        exec('\n'.join(source), namespace)
+        return namespace['format']
+
+    scale = pattern.scale
+    int_min = pattern.int_prec[0]
+    frac_min, frac_max = pattern.frac_prec
+    group1, group2 = pattern.grouping
+    source = ['def format(value, currency=None):']
+    if currency:
+        if u('\xa4\xa4') in ''.join(affixes):
+            source.append(' code = currency.upper()')
+        source.append(' symbol = CURRENCY_SYMBOLS.get(currency, currency)')
+
+    # integer and fraction digits
+    if scale == 1:
+        digits = "'%d' % -value", "'%d' % value"
+    else:
+        digits = ("'%%d' %% (-value * %d)" % scale,
+                  "'%%d' %% (value * %d)" % scale)
+    source.extend([
+        ' if isinstance(value, INTEGER_TYPES):',
+        '  if value < 0:',
+        '   negative = True',
+        '   a = %s' % digits[0],
+        '  else:',
+        '   negative = False',
+        '   a = %s' % digits[1],
+        '  b = %r' % (frac_min and symbols['decimal'] + '0' * frac_min or
+                      u('')),
+        ' else:',
+        '  negative = value < 0',
+        '  a, b = round_digits(value, %d, %d)' % (frac_max, scale),
+    ])
+    if frac_max == 0:
+        source.append('  b = %r' % u(''))
+    elif frac_min == 0:
+        source.append('  if b: b = %r + b' % symbols['decimal'])
+    else:
+        source.extend([
+            '  if len(b) < %d: b += %r * (%d - len(b))' % (frac_min, '0',
+                                                          frac_min),
+            '  b = %r + b' % symbols['decimal'],
+        ])
+
+    # minimum integer digits and grouping
+    if int_min > 1:
+        source.append(' if len(a) < %d: a = %r * (%d - len(a)) + a' % (
+            int_min, '0', int_min))
+    if group1 < 1000 and group2 > 0:
+        group = repr(symbols['group'])
+        if group1 == group2:
+            source.extend([
+                ' if len(a) > %d:' % group1,
+                '  head = len(a) %% %d or %d' % (group1, group1),
+                '  a = %s.join([a[:head]] + [a[i:i + %d] for i in '
+                'range(head, len(a), %d)])' % (group, group1, group1),
+            ])
+        else:
+            source.extend([
+                ' if len(a) > %d:' % group1,
+                '  rest = a[:-%d]' % group1,
+                '  head = len(rest) %% %d or %d' % (group2, group2),
+                '  a = %s.join([rest[:head]] + [rest[i:i + %d] for i in '
+                'range(head, len(rest), %d)] + [a[-%d:]])' % (
+                    group, group2, group2, group1),
+            ])
+
+    source.extend([
+        ' if negative:',
+        '  return %s + a + b + %s' % (_affix_source(pattern.prefix[1]),
+                                      _affix_source(pattern.suffix[1])),
+        ' return %s + a + b + %s' % (_affix_source(pattern.prefix[0]),
+                                     _affix_source(pattern.suffix[0])),
+    ])
+    exec('\n'.join(source), namespace)
+    return namespace['format']
+
+
 class NumberPattern(object):
 
     def __init__(self, pattern, prefix, suffix, grouping,
@@ -469,10 +978,24 @@ class NumberPattern(object):
         return '<%s %s>' % (type(self).__name__, pattern)
 
     def apply(self, value, locale, currency=None):
-        value *= self.scale
+        currency_symbol = None
+        if currency is not None:
+            currency_symbol = get_currency_symbol(currency, locale)
+        return self._apply(value, _get_symbols(locale), currency,
+                           currency_symbol)
+
+    def _apply(self, value, symbols, currency=None, currency_symbol=None):
         is_negative = int(value < 0)
-        if self.exp_prec: # Scientific notation
-            value = abs(value)
+        if isinstance(value, integer_types) and not self.exp_prec and \
+                '@' not in self.pattern:
+            # Integers need no rounding, and have no fraction digits
+            number = self._format_int(str(abs(value) * self.scale),
+                                      self.int_prec[0], self.int_prec[1],
+                                      symbols)
+            if self.frac_prec[0]:
+                number += symbols['decimal'] + '0' * self.frac_prec[0]
+        elif self.exp_prec: # Scientific notation
+            value = abs(value) * self.scale
             if value:
                 exp = int(math.floor(math.log(value, 10)))
             else:
@@ -491,43 +1014,95 @@ class NumberPattern(object):
                 value = value / 10**exp
             exp_sign = ''
             if exp < 0:
-                exp_sign = get_minus_sign_symbol(locale)
+                exp_sign = symbols['minusSign']
             elif self.exp_plus:
-                exp_sign = get_plus_sign_symbol(locale)
+                exp_sign = symbols['plusSign']
             exp = abs(exp)
             number = u('%s%s%s%s') % \
                  (self._format_sigdig(value, self.frac_prec[0], 
                                      self.frac_prec[1]), 
-                  get_exponential_symbol(locale),  exp_sign,
+                  symbols['exponential'],  exp_sign,
                   self._format_int(str(exp), self.exp_prec[0],
-                                   self.exp_prec[1], locale))
+                                   self.exp_prec[1], symbols))
         elif '@' in self.pattern: # Is it a siginificant digits pattern?
-            text = self._format_sigdig(abs(value),
+            text = self._format_sigdig(abs(value) * self.scale,
                                       self.int_prec[0],
                                       self.int_prec[1])
             if '.' in text:
                 a, b = text.split('.')
-                a = self._format_int(a, 0, 1000, locale)
+                a = self._format_int(a, 0, 1000, symbols)
                 if b:
-                    b = get_decimal_symbol(locale) + b
+                    b = symbols['decimal'] + b
                 number = a + b
             else:
-                number = self._format_int(text, 0, 1000, locale)
+                number = self._format_int(text, 0, 1000, symbols)
         else: # A normal number pattern
-            a, b = split_number(bankersround(abs(value), 
-                                             self.frac_prec[1]))
+            a, b = _round_digits(value, self.frac_prec[1], self.scale)
             b = b or '0'
             a = self._format_int(a, self.int_prec[0],
-                                 self.int_prec[1], locale)
-            b = self._format_frac(b, locale)
+                                 self.int_prec[1], symbols)
+            b = self._format_frac(b, symbols)
             number = a + b
         retval = u('%s%s%s') % (self.prefix[is_negative], number,
                                 self.suffix[is_negative])
         if u('\xa4') in retval:
             retval = retval.replace(u('\xa4\xa4'), currency.upper())
-            retval = retval.replace(u('\xa4'), get_currency_symbol(currency, locale))
+            retval = retval.replace(u('\xa4'), currency_symbol)
         return retval
 
+    def _apply_many(self, values, locale, currency=None):
+        format = compile_pattern(self, locale)
+        # NumPy is only used if it has been imported already, as otherwise
+        # the values can not be a NumPy array anyway
+        numpy = sys.modules.get('numpy')
+        if numpy is None or not isinstance(values, numpy.ndarray):
+            return [format(value, currency) for value in values]
+        result = numpy.empty(values.shape, dtype=object)
+        values = values.ravel()
+        if values.dtype.kind in 'iu' and not self.exp_prec and \
+                '@' not in self.pattern:
+            texts = self._apply_ints(numpy, values, _get_symbols(locale),
+                                     currency, locale.currency_symbols.get(
+                                         currency, currency))
+        else:
+            texts = None
+        if texts is None:
+            texts = [format(value, currency) for value in values.tolist()]
+        result.ravel()[:] = texts
+        return result
+
+    def _apply_ints(self, numpy, values, symbols, currency, currency_symbol):
+        """Format an array of integers with a normal number pattern, with the
+        scaling and the conversion to digits done by NumPy.
+
+        Return `None` if the scaled values might not fit into the integer
+        type of the array.
+        """
+        info = numpy.iinfo(values.dtype)
+        if self.scale != 1 or info.min < 0:
+            limit = (info.max - 1) // self.scale
+            if len(values) and (values.max() > limit or
+                                values.min() < -limit):
+                return None
+            values = values * self.scale
+        negative = (values < 0).tolist()
+        digits = numpy.absolute(values).astype(str).tolist()
+        # integers have no fraction digits, so the fraction part is the same
+        # for all of them
+        frac = self._format_frac('0', symbols)
+        prefix, suffix = self.prefix, self.suffix
+        if u('\xa4') in ''.join(prefix + suffix):
+            prefix, suffix = [[
+                affix.replace(u('\xa4\xa4'), currency.upper())
+                     .replace(u('\xa4'), currency_symbol)
+                for affix in affixes] for affixes in (prefix, suffix)]
+        format_int = self._format_int
+        min, max = self.int_prec
+        return [u('%s%s%s%s') % (prefix[is_negative],
+                                 format_int(text, min, max, symbols), frac,
+                                 suffix[is_negative])
+                for is_negative, text in zip(negative, digits)]
+
     def _format_sigdig(self, value, min, max):
         """Convert value to a string.
 
@@ -554,20 +1129,24 @@ class NumberPattern(object):
             return '%s.%s' % (a, b)
         return a
 
-    def _format_int(self, value, min, max, locale):
+    def _format_int(self, value, min, max, symbols):
         width = len(value)
         if width < min:
             value = '0' * (min - width) + value
         gsize = self.grouping[0]
-        ret = ''
-        symbol = get_group_symbol(locale)
+        if len(value) <= gsize:
+            return value
+        groups = [value[-gsize:]]
+        value = value[:-gsize]
+        gsize = self.grouping[1]
         while len(value) > gsize:
-            ret = symbol + value[-gsize:] + ret
+            groups.append(value[-gsize:])
             value = value[:-gsize]
-            gsize = self.grouping[1]
-        return value + ret
+        groups.append(value)
+        groups.reverse()
+        return symbols['group'].join(groups)
 
-    def _format_frac(self, value, locale):
+    def _format_frac(self, value, symbols):
         min, max = self.frac_prec
         if len(value) < min:
             value += ('0' * (min - len(value)))
@@ -576,4 +1155,4 @@ class NumberPattern(object):
         width = len(value)
         while len(value) > min and value[-1] == '0':
             value = value[:-1]
-        return get_decimal_symbol(locale) + value
+        return symbols['decimal'] + value
@@ -14,16 +14,18 @@
 import unittest
 
 def suite():
-    from babel.tests import core, dates, localedata, numbers, plural, \
-                            support, util
+    from babel.tests import archive, core, dates, localedata, numbers, \
+                            plural, subset_data, support, util
     from babel.messages import tests as messages
     suite = unittest.TestSuite()
+    suite.addTest(archive.suite())
     suite.addTest(core.suite())
     suite.addTest(dates.suite())
     suite.addTest(localedata.suite())
     suite.addTest(messages.suite())
     suite.addTest(numbers.suite())
     suite.addTest(plural.suite())
+    suite.addTest(subset_data.suite())
     suite.addTest(support.suite())
     suite.addTest(util.suite())
     return suite
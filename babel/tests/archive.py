@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+import doctest
+import os
+import shutil
+import tempfile
+import unittest
+
+from babel import archive
+from babel.compat import b, u
+from babel.dates import parse_pattern as parse_datetime_pattern
+from babel.localedata import Alias
+from babel.numbers import parse_pattern as parse_number_pattern
+try:
+    from babel.plural import PluralRule
+except Exception: # the module does not compile on every Python version
+    PluralRule = None
+
+
+class ArchiveTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dirname, 'test.arc')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_roundtrip(self):
+        archive.write_archive(self.filename, [('a', {1: 'one'}),
+                                              ('b', [2, 3])],
+                              meta={'origin': 'test'})
+        arc = archive.Archive(self.filename)
+        try:
+            self.assertEqual(['a', 'b'], sorted(arc.keys()))
+            self.assertEqual({1: 'one'}, arc.load('a'))
+            self.assertEqual([2, 3], arc.load('b'))
+            self.assertEqual('test', arc.meta['origin'])
+            self.assertTrue('a' in arc)
+            self.assertFalse('c' in arc)
+            self.assertRaises(KeyError, arc.load, 'c')
+        finally:
+            arc.close()
+
+    def test_replace_existing(self):
+        archive.write_archive(self.filename, [('a', 1)])
+        archive.write_archive(self.filename, [('a', 2)])
+        arc = archive.Archive(self.filename)
+        try:
+            self.assertEqual(2, arc.load('a'))
+        finally:
+            arc.close()
+        self.assertEqual(['test.arc'], os.listdir(self.dirname))
+
+    def test_not_an_archive(self):
+        fileobj = open(self.filename, 'wb')
+        try:
+            fileobj.write(b('x') * 64)
+        finally:
+            fileobj.close()
+        self.assertRaises(ValueError, archive.Archive, self.filename)
+
+
+class BackendTestCase(unittest.TestCase):
+
+    value = {
+        'names': {'de': u('Deutsch'), 'sv': u('Schwedisch'), None: u('')},
+        'numbers': (0, 1, -1, 127, 128, -300, 2 ** 70, 1.25),
+        'flags': [True, False, None],
+        'pattern': parse_number_pattern(u('#,##0.00 \xa4')),
+        'date': {'short': parse_datetime_pattern(u('dd.MM.yy'))},
+        'alias': (Alias(['months', 'format']), {3: u('M\xe4rz')}),
+    }
+
+    def _check_roundtrip(self, backend):
+        decoded = backend.loads(backend.dumps(self.value))
+        self.assertEqual(sorted(self.value), sorted(decoded))
+        for key in ('names', 'numbers', 'flags'):
+            self.assertEqual(self.value[key], decoded[key])
+        pattern = decoded['pattern']
+        self.assertEqual(self.value['pattern'].__dict__, pattern.__dict__)
+        self.assertEqual(type(self.value['pattern']), type(pattern))
+        self.assertEqual(u('dd.MM.yy'), decoded['date']['short'].pattern)
+        alias, others = decoded['alias']
+        self.assertEqual(('months', 'format'), alias.keys)
+        self.assertEqual({3: u('M\xe4rz')}, others)
+
+    def test_pickle(self):
+        for protocol in range(2, archive.pickle.HIGHEST_PROTOCOL + 1):
+            self._check_roundtrip(archive.get_backend('pickle',
+                                                      protocol=protocol))
+
+    def test_marshal(self):
+        self._check_roundtrip(archive.get_backend('marshal'))
+
+    def test_binary(self):
+        self._check_roundtrip(archive.get_backend('binary'))
+
+    def test_unsupported_objects(self):
+        for name in ('marshal', 'binary'):
+            backend = archive.get_backend(name)
+            self.assertRaises(TypeError, backend.dumps, {'x': self})
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, archive.get_backend, 'json')
+
+    def test_backend_recorded(self):
+        dirname = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(dirname, 'test.arc')
+            archive.write_archive(filename, [('a', self.value)],
+                                  backend='binary')
+            arc = archive.Archive(filename)
+            try:
+                self.assertEqual('binary', arc.meta['backend'])
+                self.assertEqual(self.value['names'], arc.load('a')['names'])
+            finally:
+                arc.close()
+        finally:
+            shutil.rmtree(dirname)
+
+
+class PluralRuleBackendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        if PluralRule is None:
+            self.skipTest('babel.plural cannot be imported')
+
+    def _check_roundtrip(self, backend):
+        rule = PluralRule({'one': 'n is 1', 'few': 'n mod 10 in 2..4'})
+        decoded = backend.loads(backend.dumps({'plural_form': rule}))
+        decoded = decoded['plural_form']
+        self.assertEqual(PluralRule, type(decoded))
+        self.assertEqual(rule.rules, decoded.rules)
+        for n in (1, 3, 5, 23):
+            self.assertEqual(rule(n), decoded(n))
+
+    def test_pickle(self):
+        self._check_roundtrip(archive.get_backend('pickle'))
+
+    def test_marshal(self):
+        self._check_roundtrip(archive.get_backend('marshal'))
+
+    def test_binary(self):
+        self._check_roundtrip(archive.get_backend('binary'))
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(doctest.DocTestSuite(archive))
+    suite.addTest(unittest.makeSuite(ArchiveTestCase))
+    suite.addTest(unittest.makeSuite(BackendTestCase))
+    suite.addTest(unittest.makeSuite(PluralRuleBackendTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
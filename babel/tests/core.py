@@ -12,10 +12,18 @@
 # history and logs, available at http://babel.edgewall.org/log/.
 
 import doctest
+import gc
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+import weakref
 
-from babel import core
+from babel.compat import pickle, u
+
+from babel import core, localedata
 from babel.core import default_locale, Locale, UnknownLocaleError
 
 class DefaultLocaleTest(unittest.TestCase):
@@ -47,10 +55,255 @@ class DefaultLocaleTest(unittest.TestCase):
         self.assertRaises(UnknownLocaleError, Locale.parse, 'en_DE')
 
 
+class LocaleInterningTest(unittest.TestCase):
+
+    def test_same_instance(self):
+        locale = Locale('de', 'AT')
+        self.assertTrue(Locale.parse('de_AT') is locale)
+        self.assertTrue(Locale.parse('de-AT', sep='-') is locale)
+        self.assertTrue(Locale('de', territory='AT') is locale)
+
+    def test_hash(self):
+        locales = set([Locale('de', 'AT'), Locale.parse('de_AT')])
+        self.assertEqual(1, len(locales))
+        self.assertEqual(hash('de_AT'), hash(Locale('de', 'AT')))
+
+    def test_immutable(self):
+        locale = Locale('de', 'AT')
+        self.assertRaises(AttributeError, setattr, locale, 'territory', 'CH')
+        self.assertEqual('AT', locale.territory)
+
+    def test_slots(self):
+        locale = Locale('zh', 'TW', 'Hant')
+        self.assertFalse(hasattr(locale, '__dict__'))
+        self.assertEqual('zh_Hant_TW', str(locale))
+        self.assertTrue(weakref.ref(locale)() is locale)
+
+    def test_equality(self):
+        de_at = Locale('de', 'AT')
+        self.assertEqual(de_at, Locale.parse('de_AT'))
+        self.assertEqual(de_at, 'de_AT')
+        self.assertNotEqual(de_at, Locale('de'))
+        self.assertNotEqual(de_at, 'de')
+        table = {de_at: 'Austria', Locale('de'): 'German'}
+        self.assertEqual('Austria', table[Locale.parse('de-AT', sep='-')])
+        self.assertEqual('German', table['de'])
+
+    def test_pickle(self):
+        locale = Locale('de', 'AT')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertTrue(pickle.loads(pickle.dumps(locale, protocol))
+                            is locale)
+
+    def test_shared_data(self):
+        de_at = Locale('de', 'AT')
+        self.assertTrue(de_at._data is Locale.parse('de_AT')._data)
+
+    def test_data_access_bypasses_cache(self):
+        locale = Locale('de', 'AT')
+        locale.months
+        hits = localedata.cache_info()['hits']
+        for i in range(10):
+            locale.months
+            locale.number_symbols
+        self.assertEqual(hits, localedata.cache_info()['hits'])
+
+    def test_evicted_data_released(self):
+        locale = Locale('de', 'CH')
+        localedata.clear_cache()
+        data = weakref.ref(locale._data)
+        self.assertTrue(data() is not None)
+        localedata.clear_cache()
+        gc.collect()
+        self.assertTrue(data() is None)
+        self.assertEqual(u('Januar'), locale.months['format']['wide'][1])
+        self.assertTrue('de_CH' in localedata._cache)
+
+
+class LocaleNegotiatorTest(unittest.TestCase):
+
+    def test_same_results_as_negotiate_locale(self):
+        available = ['de_DE', 'de_AT', 'en', 'ja_JP', 'nb_NO', 'pt_BR', '']
+        negotiator = core.LocaleNegotiator(available)
+        for preferred in (['de_DE', 'en_US'], ['de_de'], ['en_US', 'de'],
+                          ['ja', 'en_US'], ['no', 'sv'], ['pt', 'de_CH'],
+                          ['fr', 'de_ch', 'en-us'], ['fr_FR'], []):
+            self.assertEqual(core.negotiate_locale(preferred, available),
+                             negotiator.negotiate(preferred))
+
+    def test_separator_and_aliases(self):
+        negotiator = core.LocaleNegotiator(['en-us', 'de-de'], sep='-')
+        self.assertEqual('de-DE', negotiator.negotiate(['de-DE', 'de']))
+        self.assertEqual('de-DE', negotiator.negotiate(['de']))
+        self.assertEqual(Locale('de', 'DE'), negotiator.get_locale(['de']))
+        negotiator = core.LocaleNegotiator(['de_DE'], aliases=None)
+        self.assertEqual(None, negotiator.negotiate(['de']))
+
+    def test_results_cached(self):
+        negotiator = core.LocaleNegotiator(['de_DE', 'en_US'])
+        negotiator.cache_size = 2
+        self.assertEqual('en_US', negotiator.negotiate(['fr', 'en_US']))
+        self.assertEqual('en_US', negotiator.negotiate(('fr', 'en_US')))
+        self.assertEqual(1, len(negotiator._cache))
+        negotiator.negotiate(['de'])
+        negotiator.negotiate(['en'])
+        self.assertEqual(1, len(negotiator._cache))
+
+
+class AcceptLanguageTest(unittest.TestCase):
+
+    def test_quality_order(self):
+        self.assertEqual(['fr_CH', 'fr', 'en', 'de'],
+                         core.parse_accept_language(
+                             'fr-CH, fr;q=0.9, en;q=0.8, de;q=0.7'))
+        self.assertEqual(['en', 'de'],
+                         core.parse_accept_language('de;q=0.5,en'))
+        self.assertEqual(['da', 'en_GB', 'en'],
+                         core.parse_accept_language(
+                             'da, en-gb;q=0.8, en;q=0.7'))
+
+    def test_separators_and_case(self):
+        self.assertEqual(['zh-Hant-TW', 'pt-BR'],
+                         core.parse_accept_language('ZH_hant_tw, pt-br',
+                                                    sep='-'))
+        self.assertEqual(['zh_Hant_TW'],
+                         core.parse_accept_language('zh-Hant-TW'))
+
+    def test_malformed(self):
+        self.assertEqual([], core.parse_accept_language(''))
+        self.assertEqual(['en'], core.parse_accept_language(
+            ' , de;q=abc, fr;q=0, en;q=2, it;q=nan'))
+        self.assertEqual(['de', 'en'],
+                         core.parse_accept_language('de, en, DE;q=0.5'))
+
+    def test_wildcard(self):
+        preferred = core.parse_accept_language('es, *;q=0.5')
+        self.assertEqual(['es', '*'], preferred)
+        negotiator = core.LocaleNegotiator(['en_US', 'de'])
+        self.assertEqual('en_US', negotiator.negotiate(preferred))
+        self.assertEqual(None, core.LocaleNegotiator([]).negotiate(preferred))
+
+    def test_wildcard_negotiate_locale(self):
+        # negotiate_locale() keeps treating '*' as an unknown locale
+        preferred = core.parse_accept_language('es, *;q=0.5')
+        self.assertEqual(None, core.negotiate_locale(preferred,
+                                                     ['en_US', 'de']))
+        self.assertEqual(None, core.negotiate_locale(['*'], ['de', 'en']))
+        self.assertEqual('en', core.negotiate_locale(['*', 'en'],
+                                                     ['de', 'en']))
+
+    def test_cached(self):
+        header = 'de-AT, de;q=0.9'
+        result = core.parse_accept_language(header)
+        self.assertTrue((header, '_') in core._accept_language_cache)
+        result.append('xx')
+        self.assertEqual(['de_AT', 'de'], core.parse_accept_language(header))
+
+
+class GlobalDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        datfile = os.path.join(self.dirname, 'global.dat')
+        fileobj = open(datfile, 'wb')
+        try:
+            pickle.dump({'zone_aliases': {'UTC': 'Etc/GMT'},
+                         'meta_zones': {'Europe/Berlin': 'Europe_Central'}},
+                        fileobj, 2)
+        finally:
+            fileobj.close()
+        filename = os.path.join(self.dirname, 'global.arc')
+        core.build_global_archive(filename, datfile)
+        self._old_archive = core._global_archive
+        self._old_segments = core._global_segments
+        core._global_archive = core.Archive(filename)
+        core._global_segments = {}
+
+    def tearDown(self):
+        core._global_archive.close()
+        core._global_archive = self._old_archive
+        core._global_segments = self._old_segments
+        shutil.rmtree(self.dirname)
+
+    def test_keys_loaded_on_demand(self):
+        self.assertEqual('Etc/GMT', core.get_global('zone_aliases')['UTC'])
+        self.assertEqual(['zone_aliases'], list(core._global_segments))
+        self.assertTrue(core.get_global('zone_aliases') is
+                        core.get_global('zone_aliases'))
+
+    def test_missing_key(self):
+        self.assertEqual({}, core.get_global('territory_zones'))
+
+
+# Records what importing the Babel modules does with the environment and the
+# file system, and prints it as the repr of a dictionary
+IMPORT_SCRIPT = '''
+import os, sys
+sys.path.insert(0, %r)
+accessed = []
+class Environ(dict):
+    def __getitem__(self, key):
+        accessed.append(key)
+        return dict.__getitem__(self, key)
+    def get(self, key, default=None):
+        accessed.append(key)
+        return dict.get(self, key, default)
+    def __contains__(self, key):
+        accessed.append(key)
+        return dict.__contains__(self, key)
+os.environ = Environ(os.environ)
+_getenv = os.getenv
+def getenv(key, default=None):
+    accessed.append(key)
+    return _getenv(key, default)
+os.getenv = getenv
+listed = []
+_listdir = os.listdir
+def listdir(path):
+    listed.append(path)
+    return _listdir(path)
+os.listdir = listdir
+import babel, babel.numbers, babel.dates, babel.messages
+from babel import localedata
+sys.stdout.write(repr({
+    'environ': accessed,
+    'listdir': listed,
+    'modules': [name for name in ('pkg_resources', 'babel.messages.checkers')
+                if name in sys.modules],
+    'localedata': [localedata._archive, localedata._manifest,
+                   sorted(localedata._cache)],
+}))
+'''
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_no_work_at_import(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(core.__file__)))
+        process = subprocess.Popen([sys.executable, '-c',
+                                    IMPORT_SCRIPT % root],
+                                   stdout=subprocess.PIPE)
+        output = process.communicate()[0]
+        self.assertEqual(0, process.returncode)
+        self.assertEqual({'environ': [], 'listdir': [], 'modules': [],
+                          'localedata': [None, None, []]},
+                         eval(output))
+
+    def test_default_locale_resolved_lazily(self):
+        from babel import numbers
+        self.assertTrue(isinstance(numbers.LC_NUMERIC, core.DefaultLocale))
+        self.assertEqual('LC_NUMERIC', numbers.LC_NUMERIC.category)
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(doctest.DocTestSuite(core))
     suite.addTest(unittest.makeSuite(DefaultLocaleTest))
+    suite.addTest(unittest.makeSuite(LocaleInterningTest))
+    suite.addTest(unittest.makeSuite(LocaleNegotiatorTest))
+    suite.addTest(unittest.makeSuite(AcceptLanguageTest))
+    suite.addTest(unittest.makeSuite(GlobalDataTest))
+    suite.addTest(unittest.makeSuite(ImportTest))
     return suite
 
 if __name__ == '__main__':
@@ -12,9 +12,19 @@
 # history and logs, available at http://babel.edgewall.org/log/.
 
 import doctest
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
 from babel import localedata
+from babel.compat import u
 
 
 class MergeResolveTestCase(unittest.TestCase):
@@ -62,11 +72,382 @@ class MergeResolveTestCase(unittest.TestCase):
             'y': {'a': 1, 'b': 22, 'c': 3, 'd': 14, 'e': 25}
         }, dict(d.items()))
 
+    def test_copy_to_dict(self):
+        alias = localedata.Alias('x')
+        d = localedata.LocaleDataDict({'x': {'a': 1}, 'y': alias, 'z': 2})
+        d['z']
+        copied = {}
+        copied.update(d)
+        for data in (dict(d), copied):
+            self.assertEqual(['x', 'y', 'z'], sorted(data))
+            self.assertEqual(1, data['y']['a'])
+            self.assertEqual(2, data['z'])
+
+    def test_inherit_matches_merge(self):
+        alias = localedata.Alias('x')
+        base = {
+            'x': {'a': 1, 'b': {'c': 2, 'd': 3}},
+            'y': alias,
+            'z': {'e': 4}
+        }
+        overrides = {
+            'x': {'b': {'d': 13}},
+            'y': {'b': 22},
+            'z': {'e': 4},
+            'w': 5
+        }
+        expected = base.copy()
+        localedata.merge(expected, overrides)
+        data = localedata.inherit(base, overrides)
+        self.assertEqual(expected, data)
+        self.assertEqual({'c': 2, 'd': 3}, base['x']['b'])
+        self.assertTrue(data['z'] is base['z'])
+
+    def test_inherit_without_changes(self):
+        base = {'x': {'a': 1}, 'y': localedata.Alias('x')}
+        self.assertTrue(localedata.inherit(base, {'x': {}, 'y': {}}) is base)
+        self.assertTrue(localedata.inherit(base, {'x': {'a': 1}}) is base)
+
+    def test_load_shares_inherited_data(self):
+        de = localedata.load('de')
+        de_at = localedata.load('de_AT')
+        self.assertTrue(de_at['languages'] is de['languages'])
+        self.assertFalse(de_at['months'] is de['months'])
+        self.assertTrue(de_at['months']['stand-alone'] is
+                        de['months']['stand-alone'])
+
+    def test_strings_shared_across_locales(self):
+        localedata.clear_cache()
+        localedata.set_string_dedup()
+        try:
+            de = localedata.load('de')
+            fr = localedata.load('fr')
+        finally:
+            localedata.set_string_dedup(False)
+        self.assertTrue(de['currency_symbols']['EUR'] is
+                        fr['currency_symbols']['EUR'])
+        de_key = [key for key in de['currency_names'] if key == 'EUR'][0]
+        fr_key = [key for key in fr['currency_names'] if key == 'EUR'][0]
+        self.assertTrue(de_key is fr_key)
+
+    def test_strings_not_shared_by_default(self):
+        localedata.clear_cache()
+        de = localedata.load('de')
+        fr = localedata.load('fr')
+        self.assertEqual(de['territories']['BF'], fr['territories']['BF'])
+        self.assertFalse(de['territories']['BF'] is fr['territories']['BF'])
+        self.assertEqual({}, localedata._strings)
+
+
+class ArchiveTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dirname, 'localedata.arc')
+        self._old_archive = localedata._archive
+
+    def tearDown(self):
+        if localedata._archive:
+            localedata._archive.close()
+        localedata._archive = self._old_archive
+        localedata.clear_cache()
+        shutil.rmtree(self.dirname)
+
+    def _use_archive(self, **kwargs):
+        localedata.build_archive(self.filename, **kwargs)
+        localedata._archive = localedata.Archive(self.filename)
+        localedata.clear_cache()
+
+    def test_load_from_archive(self):
+        localedata.clear_cache()
+        expected = localedata.load('de_AT')
+        self._use_archive()
+        data = localedata.load('de_AT')
+        self.assertEqual(sorted(expected.keys()), sorted(data.keys()))
+        for key in expected:
+            # patterns and aliases do not implement __eq__, so compare reprs
+            self.assertEqual(repr(expected[key]), repr(data[key]))
+        self.assertTrue(data is localedata.load('de_AT'))
+
+    def test_sections_decoded_on_access(self):
+        self._use_archive()
+        data = localedata.load('de_AT')
+        self.assertFalse('languages' in data.data)
+        locale_data = localedata.LocaleDataDict(data)
+        self.assertEqual(u('Schwedisch'), locale_data['languages']['sv'])
+        self.assertEqual(['languages'], list(data.data.keys()))
+        self.assertTrue(data.parent['languages'] is data['languages'])
+
+    def test_resolved_aliases(self):
+        datadir = os.path.join(self.dirname, 'localedata')
+        os.mkdir(datadir)
+        for name in ('root', 'de', 'de_AT', 'de_CH'):
+            shutil.copy(os.path.join(localedata._dirname, name + '.dat'),
+                        datadir)
+        expected = localedata.load_resolved('de_AT')
+        self._use_archive(dirname=datadir, resolve_aliases=True)
+        data = localedata.load_resolved('de_AT')
+        self.assertFalse(isinstance(data, localedata.LocaleDataDict))
+        months = data['months']
+        self.assertEqual(dict, type(months['format']['abbreviated']))
+        self.assertEqual(u('J\xe4n'), months['format']['abbreviated'][1])
+        self.assertEqual(repr(expected['months']['stand-alone']['narrow']),
+                         repr(months['stand-alone']['narrow']))
+        self.assertEqual(repr(expected['date_formats']),
+                         repr(data['date_formats']))
+
+    def test_identifiers_from_archive(self):
+        expected = sorted(localedata.locale_identifiers())
+        self._use_archive()
+        self.assertEqual(expected, sorted(localedata.locale_identifiers()))
+        self.assertTrue(localedata.exists('de_AT'))
+        self.assertFalse(localedata.exists('xx_XX'))
+        self.assertRaises(IOError, localedata.load, 'xx_XX')
+        parents = localedata._archive.meta['parents']
+        self.assertEqual('de', parents['de_AT'])
+        self.assertEqual(None, parents['root'])
+
+
+class ManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._old_archive = localedata._archive
+        localedata._archive = False
+        localedata.clear_cache()
+        self.calls = []
+        self._listdir = os.listdir
+        self._exists = os.path.exists
+        def listdir(path):
+            self.calls.append(('listdir', path))
+            return self._listdir(path)
+        def exists(path):
+            self.calls.append(('exists', path))
+            return self._exists(path)
+        os.listdir = listdir
+        os.path.exists = exists
+
+    def tearDown(self):
+        os.listdir = self._listdir
+        os.path.exists = self._exists
+        localedata._archive = self._old_archive
+        localedata.clear_cache()
+
+    def test_directory_listed_once(self):
+        self.assertTrue(localedata.exists('de_AT'))
+        self.assertFalse(localedata.exists('xx_XX'))
+        identifiers = localedata.locale_identifiers()
+        self.assertTrue('de_AT' in identifiers)
+        self.assertFalse('root' in identifiers)
+        self.assertEqual(identifiers, localedata.locale_identifiers())
+        self.assertEqual([('listdir', localedata._dirname)], self.calls)
+
+    def test_clear_cache_rereads_manifest(self):
+        localedata.exists('de_AT')
+        localedata.clear_cache()
+        localedata.exists('de_AT')
+        self.assertEqual(2, len(self.calls))
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        localedata.clear_cache()
+
+    def tearDown(self):
+        localedata.set_cache_limits()
+        localedata.clear_cache()
+
+    def test_stats(self):
+        localedata.load('de_AT')
+        localedata.load('de_AT')
+        localedata.load('de')
+        info = localedata.cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(3, info['misses'])
+        self.assertEqual(0, info['evictions'])
+        self.assertEqual(3, info['entries'])
+        self.assertTrue(info['size'] > 0)
+
+    def test_evicts_least_recently_used(self):
+        localedata.set_cache_limits(max_entries=4)
+        localedata.load('de_AT')
+        localedata.load('de_CH')
+        localedata.load('de_AT')
+        localedata.load('de_DE')
+        self.assertEqual(['de', 'de_AT', 'de_DE', 'root'],
+                         sorted(localedata._cache))
+        self.assertEqual(1, localedata.cache_info()['evictions'])
+
+    def test_parents_are_pinned(self):
+        # "root" and "de" are used less recently than "de_AT", but cannot be
+        # evicted while "de_AT" is still in the cache
+        localedata.load('de_AT')
+        localedata.set_cache_limits(max_entries=2)
+        self.assertEqual(['de', 'root'], sorted(localedata._cache))
+        localedata.set_cache_limits(max_entries=0)
+        self.assertEqual([], sorted(localedata._cache))
+
+    def test_max_size(self):
+        localedata.load('de_AT')
+        localedata.load('fr_CA')
+        size = localedata.cache_info()['size']
+        localedata.set_cache_limits(max_size=size - 1)
+        info = localedata.cache_info()
+        self.assertEqual(['de', 'fr', 'fr_CA', 'root'],
+                         sorted(localedata._cache))
+        self.assertTrue(info['size'] <= size - 1)
+
+    def test_concurrent_first_loads(self):
+        results = []
+        def _load():
+            results.append(localedata.load('fr_CA'))
+        threads = [threading.Thread(target=_load) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(16, len(results))
+        for data in results:
+            self.assertTrue(data is results[0])
+        # "root", "fr" and "fr_CA" have each been loaded exactly once
+        self.assertEqual(3, localedata.cache_info()['misses'])
+        self.assertEqual({}, localedata._loading)
+
+    def test_failed_load_unpins_parent(self):
+        self.assertRaises(IOError, localedata.load, 'de_XX')
+        self.assertEqual(0, localedata._cache_entries['de'][3])
+        self.assertEqual({}, localedata._loading)
+
+    def test_eviction_releases_shared_strings(self):
+        localedata.set_string_dedup()
+        self.addCleanup(localedata.set_string_dedup, False)
+        localedata.load('de_AT')
+        strings = len(localedata._strings)
+        localedata.load('ja')
+        self.assertTrue(len(localedata._strings) > strings)
+        localedata.load('de_AT')
+        # evicting "ja" removes more data than remains cached
+        localedata.set_cache_limits(max_entries=3)
+        self.assertEqual(['de', 'de_AT', 'root'], sorted(localedata._cache))
+        self.assertEqual(0, localedata._strings_evicted)
+        self.assertEqual(strings, len(localedata._strings))
+        # the rebuilt table keeps sharing the strings of the cached locales
+        de = localedata.load('de')
+        fr = localedata.load('fr')
+        self.assertTrue(de['currency_symbols']['EUR'] is
+                        fr['currency_symbols']['EUR'])
+
+    def test_unmerged_data_not_cached(self):
+        data = localedata.load('de_AT', merge_inherited=False)
+        self.assertFalse('de_AT' in localedata._cache)
+        self.assertFalse('sv' in data['languages'])
+        self.assertTrue('sv' in localedata.load('de_AT')['languages'])
+
+
+class PreloadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        localedata.clear_cache()
+
+    def tearDown(self):
+        localedata.set_cache_limits()
+        localedata.clear_cache()
+
+    def _resolved_count(self, data):
+        # number of values the views have resolved and stored so far
+        count = 0
+        if isinstance(data, localedata.LocaleDataDict):
+            count += len(data._resolved)
+            for value in data._resolved.values():
+                count += self._resolved_count(value)
+        return count
+
+    def test_no_lazy_resolution_after_preload(self):
+        localedata.preload(['de_AT', 'fr_FR'])
+        data = localedata.load_resolved('de_AT')
+        count = self._resolved_count(data)
+        self.assertEqual(u('J\xe4nner'), data['months']['format']['wide'][1])
+        data['months']['stand-alone']['abbreviated'][1]
+        data['currency_formats'][None]
+        self.assertEqual(count, self._resolved_count(data))
+
+    def test_only_requested_sections(self):
+        localedata.preload(['de_AT'], sections=['months'])
+        data = localedata.load_resolved('de_AT')
+        self.assertTrue('months' in data._resolved)
+        self.assertFalse('languages' in data._resolved)
+
+    def test_preloaded_locales_not_evicted(self):
+        localedata.preload(['de_AT', 'de_CH'])
+        localedata.set_cache_limits(max_entries=1)
+        for name in ('fr', 'it', 'es'):
+            localedata.load(name)
+        self.assertTrue('de_AT' in localedata._cache)
+        self.assertTrue('de_CH' in localedata._cache)
+        self.assertFalse('fr' in localedata._cache)
+
+    def test_unknown_locale(self):
+        self.assertRaises(IOError, localedata.preload, ['de_AT', 'xx_XX'])
+
+
+class AsyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        localedata.clear_cache()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        localedata.clear_cache()
+
+    def test_aload(self):
+        futures = [localedata.aload('de_AT') for i in range(8)]
+        self.assertEqual(1, len(localedata._async_jobs))
+        results = self.loop.run_until_complete(asyncio.gather(*futures))
+        self.assertTrue(results[0] is localedata.load('de_AT'))
+        for data in results:
+            self.assertTrue(data is results[0])
+        self.assertEqual(3, localedata.cache_info()['misses'])
+        self.assertEqual({}, localedata._async_jobs)
+        future = localedata.aload('de_AT')
+        self.assertTrue(future.done())
+        self.assertTrue(future.result() is results[0])
+
+    def test_aload_unknown_locale(self):
+        future = localedata.aload('xx_XX')
+        self.assertRaises(IOError, self.loop.run_until_complete, future)
+
+    def test_cancel_one_caller(self):
+        first = localedata.aload('de_AT')
+        second = localedata.aload('de_AT')
+        first.cancel()
+        data = self.loop.run_until_complete(second)
+        self.assertTrue(data is localedata.load('de_AT'))
+
+    def test_aparse(self):
+        from babel.core import Locale
+        futures = [Locale.aparse('de-CH', sep='-'),
+                   Locale.aparse('de-CH', '-')]
+        results = self.loop.run_until_complete(asyncio.gather(*futures))
+        self.assertTrue(results[0] is Locale('de', 'CH'))
+        self.assertTrue(results[1] is results[0])
+        self.assertTrue('de_CH' in localedata._cache)
+        future = Locale.aparse(results[0])
+        self.assertTrue(future.done())
+
 
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(doctest.DocTestSuite(localedata))
     suite.addTest(unittest.makeSuite(MergeResolveTestCase))
+    suite.addTest(unittest.makeSuite(ArchiveTestCase))
+    suite.addTest(unittest.makeSuite(ManifestTestCase))
+    suite.addTest(unittest.makeSuite(PreloadTestCase))
+    if asyncio is not None:
+        suite.addTest(unittest.makeSuite(AsyncTestCase))
+    suite.addTest(unittest.makeSuite(CacheTestCase))
     return suite
 
 if __name__ == '__main__':
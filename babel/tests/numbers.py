@@ -15,7 +15,14 @@ from decimal import Decimal
 import doctest
 import unittest
 
-from babel import numbers
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from babel import localedata, numbers
+from babel.core import Locale
+from babel.compat import threading, u
 
 
 class FormatDecimalTestCase(unittest.TestCase):
@@ -157,12 +164,314 @@ class BankersRoundTestCase(unittest.TestCase):
         self.assertEqual(Decimal('0.2'), numbers.bankersround(Decimal('0.15'), ndigits=1))
 
 
+class ExactRoundingTestCase(unittest.TestCase):
+
+    def test_large_decimal(self):
+        self.assertEqual(u('$12,345,678,901,234,567,890.12'),
+                         numbers.format_currency(
+                             Decimal('12345678901234567890.125'), 'USD',
+                             locale='en_US'))
+        self.assertEqual(u('$12,345,678,901,234,567,890.14'),
+                         numbers.format_currency(
+                             Decimal('12345678901234567890.135'), 'USD',
+                             locale='en_US'))
+
+    def test_large_integer(self):
+        self.assertEqual(u('123,456,789,012,345,678,901'),
+                         numbers.format_decimal(123456789012345678901,
+                                                locale='en_US'))
+        self.assertEqual(u('100,000,000,000,000,000,000'),
+                         numbers.format_decimal(10 ** 20, locale='en_US'))
+
+    def test_float_precision(self):
+        self.assertEqual(u('123,456,789.123'),
+                         numbers.format_decimal(123456789.123456789,
+                                                locale='en_US'))
+        self.assertEqual(u('0.000000000012'),
+                         numbers.format_decimal(1.2e-11, '0.############',
+                                                locale='en_US'))
+        self.assertEqual(u('100,000,000,000,000,000,000'),
+                         numbers.format_decimal(1e20, locale='en_US'))
+
+    def test_half_even(self):
+        self.assertEqual(u('2.68'),
+                         numbers.format_decimal(2.675, '0.00', locale='en'))
+        self.assertEqual(u('2.66'),
+                         numbers.format_decimal(2.665, '0.00', locale='en'))
+        self.assertEqual(u('14%'),
+                         numbers.format_percent(0.145, locale='en'))
+        self.assertEqual(u('16%'),
+                         numbers.format_percent(0.155, locale='en'))
+
+    def test_not_finite(self):
+        self.assertRaises(ValueError, numbers.format_decimal,
+                          Decimal('Infinity'), locale='en')
+        self.assertRaises(ValueError, numbers.format_decimal,
+                          float('nan'), locale='en')
+
+    def test_split_number(self):
+        self.assertEqual(('1', '5'), numbers.split_number(Decimal('1.50')))
+        self.assertEqual(('-1', '5'), numbers.split_number(-1.5))
+        self.assertEqual(('0', '0000000001'), numbers.split_number(1e-10))
+        self.assertEqual(('1200', ''), numbers.split_number(Decimal('1.2E3')))
+
+
+class IntegerFormatTestCase(unittest.TestCase):
+
+    def test_same_as_generic(self):
+        patterns = ['#,##0.###', '#,##,##0.00', '0000', '#,##0.00;(#)',
+                    '#,##0%', u('\xa4#,##0.00')]
+        for locale in ('en_US', 'de_CH', 'hi_IN', 'ar'):
+            for pattern in patterns:
+                for value in (0, 7, -12345, 10 ** 25 + 1):
+                    self.assertEqual(
+                        numbers.format_currency(Decimal(value), 'EUR',
+                                                pattern, locale=locale),
+                        numbers.format_currency(value, 'EUR', pattern,
+                                                locale=locale))
+
+    def test_format_number(self):
+        self.assertEqual(u('1.234.567'),
+                         numbers.format_number(1234567, locale='de_DE'))
+        self.assertEqual(u('-12,34,567'),
+                         numbers.format_number(-1234567, locale='hi_IN'))
+        self.assertEqual(u('0'), numbers.format_number(0, locale='en_US'))
+
+
+class CompilePatternTestCase(unittest.TestCase):
+
+    values = [0, 7, -12345, 10 ** 22, True, 0.5, -0.0, 2.675, -1099.98,
+              1e-7, 3.5e15, Decimal('1.50'), Decimal('-1234567890.125')]
+
+    def _check(self, pattern, locale, currency=None):
+        func = numbers.compile_pattern(pattern, locale)
+        pattern = numbers.parse_pattern(pattern)
+        for value in self.values:
+            self.assertEqual(pattern.apply(value, locale, currency),
+                             func(value, currency))
+
+    def test_same_as_apply(self):
+        patterns = ['#,##0.###', '#,##0', '0000.0', '#,##,##0.00',
+                    '#,##0.00;(#,##0.00)', '#,##0%', u('#,##0.0\u2030'),
+                    '#', '@@@', '##0E00', '0.###E+00']
+        for locale in ('en_US', 'de_CH', 'hi_IN', 'ar', 'sv_SE'):
+            for pattern in patterns:
+                self._check(pattern, locale)
+
+    def test_currency(self):
+        patterns = [u('\xa4#,##0.00;(\xa4#,##0.00)'), u('\xa4\xa4 #,##0.00'),
+                    u('#,##0.00\xa0\xa4'), u('\xa4 0.00E0')]
+        for locale in ('en_US', 'de_DE', 'ja_JP'):
+            for pattern in patterns:
+                for currency in ('USD', 'EUR', 'XYZ'):
+                    self._check(pattern, locale, currency)
+
+    def test_cached(self):
+        func = numbers.compile_pattern('#,##0.00', 'en_US')
+        self.assertTrue(func is numbers.compile_pattern(
+            numbers.parse_pattern('#,##0.00'), Locale.parse('en_US')))
+        self.assertFalse(func is numbers.compile_pattern('#,##0.00', 'de'))
+
+    def test_negative_subpattern(self):
+        self.assertEqual(u('-1.23'), numbers.compile_pattern(
+            '#,##0.##;-#', 'en')(-1.2345))
+        self.assertEqual(u('(1.23)'), numbers.compile_pattern(
+            '#,##0.##;(#)', 'en')(-1.2345))
+
+    def test_no_locale_data_kept(self):
+        # the functions outlive the locale data in the cache, they must not
+        # keep the data of evicted locales alive
+        for pattern in ('#,##0.00', u('#,##0.00\xa0\xa4'), '##0E00',
+                        u('\xa4 0.00E0')):
+            func = numbers.compile_pattern(pattern, 'fr_CA')
+            for value in func.__globals__.values():
+                self.assertFalse(isinstance(value, localedata.LocaleDataDict))
+        func = numbers.compile_pattern(u('#,##0.00\xa0\xa4'), 'fr_CA')
+        self.assertEqual(u('1\xa0099,98\xa0$'), func(1099.98, 'CAD'))
+
+    def test_cleared_with_locale_data(self):
+        func = numbers.compile_pattern('#,##0.00', 'en_US')
+        localedata.clear_cache()
+        self.assertEqual({}, numbers._symbols)
+        self.assertFalse(func is numbers.compile_pattern('#,##0.00',
+                                                         'en_US'))
+
+
+class PatternCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        numbers.clear_pattern_cache()
+
+    def tearDown(self):
+        numbers.clear_pattern_cache()
+
+    def test_cached(self):
+        pattern = numbers.parse_pattern('#,##0.00')
+        self.assertTrue(pattern is numbers.parse_pattern('#,##0.00'))
+        info = numbers.pattern_cache_info()
+        self.assertEqual((1, 1, 1), (info['entries'], info['hits'],
+                                     info['misses']))
+
+    def test_bounded(self):
+        size = numbers._pattern_cache_size
+        numbers._pattern_cache_size = 3
+        try:
+            for pattern in ('0', '00', '000', '0000'):
+                numbers.parse_pattern(pattern)
+            info = numbers.pattern_cache_info()
+            self.assertEqual(1, info['entries'])
+            self.assertEqual(3, info['evictions'])
+        finally:
+            numbers._pattern_cache_size = size
+
+    def test_compiled_pattern_not_cached(self):
+        pattern = numbers.parse_pattern('#,##0.00')
+        numbers.clear_pattern_cache()
+        self.assertTrue(pattern is numbers.parse_pattern(pattern))
+        self.assertEqual(0, numbers.pattern_cache_info()['entries'])
+
+    def test_threads(self):
+        results = []
+        def parse():
+            for i in range(200):
+                pattern = '#,##0.' + '#' * (i % 10)
+                results.append(numbers.parse_pattern(pattern))
+        threads = [threading.Thread(target=parse) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = numbers.pattern_cache_info()
+        self.assertEqual(10, info['entries'])
+        self.assertEqual(800, info['hits'] + info['misses'])
+        self.assertEqual(10, len(set([id(p) for p in results])))
+
+
+class NumberFormatterTestCase(unittest.TestCase):
+
+    def test_same_as_functions(self):
+        for locale in ('en_US', 'de_DE', 'sv_SE', 'es_CO', 'fr_CH'):
+            formatter = numbers.NumberFormatter(locale)
+            for value in (0, -1, 1.2345, 12345.5, -1099.98, Decimal('0.34')):
+                self.assertEqual(numbers.format_decimal(value, locale=locale),
+                                 formatter.decimal(value))
+                self.assertEqual(numbers.format_currency(value, 'USD',
+                                                         locale=locale),
+                                 formatter.currency(value, 'USD'))
+                self.assertEqual(numbers.format_percent(value, locale=locale),
+                                 formatter.percent(value))
+                self.assertEqual(numbers.format_scientific(value,
+                                                           locale=locale),
+                                 formatter.scientific(value))
+
+    def test_explicit_format(self):
+        formatter = numbers.NumberFormatter('en_US')
+        self.assertEqual(u('EUR 1,099.98'),
+                         formatter.currency(1099.98, 'EUR',
+                                            u('\xa4\xa4 #,##0.00')))
+        self.assertEqual(u('1.23E06'),
+                         formatter.scientific(1234567, u('##0E00')))
+        self.assertEqual(u('25,123\u2030'),
+                         formatter.percent(25.1234, u('#,##0\u2030')))
+        self.assertEqual(u('1,099.980'),
+                         formatter.decimal(1099.98, u('#,##0.000')))
+
+    def test_unknown_currency(self):
+        formatter = numbers.NumberFormatter('en_US')
+        self.assertEqual(u('XYZ1.00'), formatter.currency(1, 'XYZ'))
+
+
+class FormatManyTestCase(unittest.TestCase):
+
+    values = [0, 1, -1, 1.2345, -1099.98, 12345.5, Decimal('0.34'), 10 ** 9]
+
+    def test_decimal(self):
+        for locale in ('en_US', 'de_DE', 'hi_IN'):
+            self.assertEqual([numbers.format_decimal(value, locale=locale)
+                              for value in self.values],
+                             numbers.format_decimal_many(self.values,
+                                                         locale=locale))
+
+    def test_currency(self):
+        self.assertEqual([numbers.format_currency(value, 'EUR', locale='de_DE')
+                          for value in self.values],
+                         numbers.format_currency_many(self.values, 'EUR',
+                                                      locale='de_DE'))
+
+    def test_percent(self):
+        self.assertEqual([numbers.format_percent(value, locale='sv_SE')
+                          for value in self.values],
+                         numbers.format_percent_many(self.values,
+                                                     locale='sv_SE'))
+
+    def test_explicit_format(self):
+        self.assertEqual([u('-1.23'), u('(1.23)')],
+                         numbers.format_decimal_many([-1.2345],
+                                                     '#,##0.##;-#',
+                                                     locale='en')
+                         + numbers.format_decimal_many([-1.2345],
+                                                       '#,##0.##;(#)',
+                                                       locale='en'))
+
+    def test_iterable(self):
+        self.assertEqual([u('1'), u('2')],
+                         numbers.format_decimal_many(iter([1, 2]),
+                                                     locale='en_US'))
+        self.assertEqual([], numbers.format_decimal_many((), locale='en_US'))
+
+
+class FormatManyNumpyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        if numpy is None:
+            self.skipTest('NumPy is not installed')
+
+    def _check(self, func, values, *args):
+        locale = 'de_CH'
+        result = func(values, *args, **{'locale': locale})
+        self.assertTrue(isinstance(result, numpy.ndarray))
+        self.assertEqual(values.shape, result.shape)
+        self.assertEqual(object, result.dtype)
+        single = getattr(numbers, func.__name__[:-len('_many')])
+        self.assertEqual([single(value, *args, **{'locale': locale})
+                          for value in values.ravel().tolist()],
+                         result.ravel().tolist())
+
+    def test_integers(self):
+        for dtype in ('int8', 'int32', 'int64', 'uint16'):
+            info = numpy.iinfo(dtype)
+            values = numpy.array([0, 1, 12, 123, info.min, info.max],
+                                 dtype=dtype)
+            self._check(numbers.format_decimal_many, values)
+            self._check(numbers.format_percent_many, values)
+            self._check(numbers.format_currency_many, values, 'USD')
+
+    def test_floats(self):
+        values = numpy.array([0, -1.5, 1.2345, 1099.98, 25.1234])
+        self._check(numbers.format_decimal_many, values)
+        self._check(numbers.format_percent_many, values)
+        self._check(numbers.format_currency_many, values, 'USD')
+
+    def test_shape(self):
+        self._check(numbers.format_decimal_many,
+                    numpy.arange(-6, 6).reshape(3, 4))
+        self._check(numbers.format_decimal_many,
+                    numpy.arange(12.0).reshape(2, 6)[:, ::2])
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(doctest.DocTestSuite(numbers))
     suite.addTest(unittest.makeSuite(FormatDecimalTestCase))
     suite.addTest(unittest.makeSuite(FormatNumberTestCase))
     suite.addTest(unittest.makeSuite(BankersRoundTestCase))
+    suite.addTest(unittest.makeSuite(ExactRoundingTestCase))
+    suite.addTest(unittest.makeSuite(IntegerFormatTestCase))
+    suite.addTest(unittest.makeSuite(CompilePatternTestCase))
+    suite.addTest(unittest.makeSuite(PatternCacheTestCase))
+    suite.addTest(unittest.makeSuite(NumberFormatterTestCase))
+    suite.addTest(unittest.makeSuite(FormatManyTestCase))
+    suite.addTest(unittest.makeSuite(FormatManyNumpyTestCase))
     return suite
 
 if __name__ == '__main__':
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+from datetime import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from babel import core, dates, localedata, numbers
+from babel.compat import u
+from babel.util import FixedOffsetTimezone
+
+_script = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts',
+                       'subset_data.py')
+
+
+def _load_script():
+    namespace = {'__name__': 'subset_data'}
+    path = sys.path[:]
+    fileobj = open(_script)
+    try:
+        exec(compile(fileobj.read(), _script, 'exec'), namespace)
+    finally:
+        fileobj.close()
+        sys.path[:] = path
+    return namespace
+
+
+class SubsetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        if not os.path.isfile(_script):
+            self.skipTest('scripts/subset_data.py is not available')
+        if not os.path.isfile(os.path.join(core._global_dirname,
+                                           'global.dat')):
+            self.skipTest('the global data is not available')
+        self.script = _load_script()
+        self.destdir = tempfile.mkdtemp()
+        self._old = (localedata._dirname, localedata._archive,
+                     core._global_dirname, core._global_archive,
+                     core._global_data)
+
+    def tearDown(self):
+        localedata._dirname, localedata._archive, core._global_dirname, \
+            core._global_archive, core._global_data = self._old
+        core._global_segments.clear()
+        localedata.clear_cache()
+        shutil.rmtree(self.destdir)
+
+    def _use_subset(self):
+        localedata._dirname = os.path.join(self.destdir, 'localedata')
+        localedata._archive = False
+        core._global_dirname = self.destdir
+        core._global_archive = False
+        core._global_data = None
+        core._global_segments.clear()
+        localedata.clear_cache()
+
+    def test_dates_and_numbers(self):
+        sections, global_keys = self.script['expand_groups'](['numbers',
+                                                              'dates'])
+        names = self.script['subset'](self.destdir, ['de_DE', 'en_US'],
+                                      sections=sections,
+                                      global_keys=global_keys)
+        self.assertEqual(['de', 'de_DE', 'en', 'en_US', 'root'], names)
+        self._use_subset()
+        self.assertFalse('languages' in localedata.load('de_DE'))
+        tzinfo = FixedOffsetTimezone(60, 'Europe/Berlin')
+        dt = datetime(2007, 4, 1, 15, 30, tzinfo=tzinfo)
+        for format in ('short', 'medium', 'long', 'full'):
+            for locale in ('de_DE', 'en_US'):
+                self.assertTrue(dates.format_time(dt, format=format,
+                                                  locale=locale))
+                self.assertTrue(dates.format_datetime(dt, format=format,
+                                                      locale=locale))
+        self.assertEqual(u('1.099,98'),
+                         numbers.format_decimal(1099.98, locale='de_DE'))
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(SubsetTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Compare the archive backends for encoding the locale data.
+
+The locale data archive is built with every backend (and every supported
+pickle protocol), and then all records of every locale are decoded in a fresh
+interpreter, once to measure the time it takes, and once more to measure the
+memory allocated for the decoded data (with `tracemalloc`, where available).
+The totals are reported per backend, and with ``--verbose`` also for every
+single locale.
+"""
+
+from optparse import OptionParser
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(sys.argv[0]), '..'))
+sys.path.insert(0, ROOT)
+
+from babel import localedata
+from babel.archive import get_backend
+from babel.compat import pickle
+
+SCRIPT = '''
+import sys, time
+sys.path.insert(0, %(root)r)
+from babel.archive import Archive
+import babel.dates, babel.numbers
+archive = Archive(%(filename)r)
+locales = archive.meta['locales']
+results = {}
+for name in locales:
+    start = time.time()
+    for section in locales[name]:
+        archive.load((name, section))
+    results[name] = [time.time() - start, None]
+try:
+    import tracemalloc
+except ImportError:
+    pass
+else:
+    keep = []
+    tracemalloc.start()
+    for name in locales:
+        before = tracemalloc.get_traced_memory()[0]
+        keep.extend([archive.load((name, section))
+                     for section in locales[name]])
+        results[name][1] = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+sys.stdout.write(repr(results))
+'''
+
+
+def measure(filename):
+    process = subprocess.Popen([sys.executable, '-c', SCRIPT % {
+        'root': ROOT, 'filename': filename
+    }], stdout=subprocess.PIPE)
+    output = process.communicate()[0]
+    if process.returncode:
+        raise SystemExit('decoding %s failed' % filename)
+    return eval(output)
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-v', '--verbose', action='store_true', dest='verbose',
+                      help='report the results for every locale')
+    parser.set_defaults(verbose=False)
+    options, args = parser.parse_args()
+    if args:
+        parser.error('incorrect number of arguments')
+
+    backends = [('pickle-%d' % protocol,
+                 get_backend('pickle', protocol=protocol))
+                for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1)]
+    backends.append(('marshal', get_backend('marshal')))
+    backends.append(('binary', get_backend('binary')))
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        results = []
+        for label, backend in backends:
+            filename = os.path.join(tmpdir, label + '.arc')
+            localedata.build_archive(filename, backend=backend)
+            results.append((label, os.path.getsize(filename),
+                            measure(filename)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print('%-10s %10s %12s %12s' % ('backend', 'size (KB)', 'decode (ms)',
+                                    'memory (KB)'))
+    for label, size, timings in results:
+        seconds = sum([result[0] for result in timings.values()])
+        memory = [result[1] for result in timings.values()]
+        if None in memory:
+            memory = '%12s' % 'n/a'
+        else:
+            memory = '%12.0f' % (sum(memory) / 1024.0)
+        print('%-10s %10.0f %12.1f %s' % (label, size / 1024.0,
+                                          seconds * 1000, memory))
+
+    if options.verbose:
+        print('')
+        print('decode time (ms) / memory (KB) per locale')
+        print('%-12s %s' % ('locale', ' '.join(['%16s' % label for label, size,
+                                                 timings in results])))
+        for name in sorted(results[0][2]):
+            cells = []
+            for label, size, timings in results:
+                seconds, memory = timings[name]
+                if memory is None:
+                    cells.append('%16.2f' % (seconds * 1000))
+                else:
+                    cells.append('%8.2f/%7.0f' % (seconds * 1000,
+                                                   memory / 1024.0))
+            print('%-12s %s' % (name, ' '.join(cells)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Benchmark for the time it takes to import the Babel modules.
+
+Every module is imported in a fresh interpreter, several times, and the best
+and median times are reported. With ``--max`` the script exits with an error
+status if the best time of any module exceeds the given number of
+milliseconds, so that it can be used to guard against regressions.
+"""
+
+from optparse import OptionParser
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(sys.argv[0]), '..'))
+MODULES = ['babel', 'babel.numbers', 'babel.dates', 'babel.messages']
+
+# Time only the import of the module itself, not the interpreter start-up
+SCRIPT = '''
+import sys, time
+sys.path.insert(0, %r)
+start = time.time()
+import %s
+sys.stdout.write(repr(time.time() - start))
+'''
+
+
+def measure(module, runs):
+    times = []
+    for i in range(runs):
+        process = subprocess.Popen([sys.executable, '-c',
+                                    SCRIPT % (ROOT, module)],
+                                   stdout=subprocess.PIPE)
+        output = process.communicate()[0]
+        if process.returncode:
+            raise SystemExit('importing %s failed' % module)
+        times.append(float(output) * 1000)
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] [module ...]')
+    parser.add_option('-n', '--runs', type='int', dest='runs',
+                      help='number of imports per module (default %default)')
+    parser.add_option('--max', type='float', dest='max',
+                      help='fail if the best import time of a module exceeds '
+                           'this many milliseconds')
+    parser.set_defaults(runs=10, max=None)
+    options, args = parser.parse_args()
+
+    failed = []
+    print('%-20s %10s %10s' % ('module', 'best ms', 'median ms'))
+    for module in args or MODULES:
+        best, median = measure(module, options.runs)
+        print('%-20s %10.1f %10.1f' % (module, best, median))
+        if options.max is not None and best > options.max:
+            failed.append(module)
+    if failed:
+        raise SystemExit('import time above %.1f ms: %s' %
+                         (options.max, ', '.join(failed)))
+
+
+if __name__ == '__main__':
+    main()
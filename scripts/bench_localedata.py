@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Benchmark suite for the locale data layer.
+
+The following operations are measured, both cold (with all caches emptied
+before every run) and warm (served from the caches):
+
+ * ``load``: `babel.localedata.load`, for every locale and all locales
+ * ``parse``: `Locale.parse`
+ * ``resolve``: resolving every alias of a locale in its `LocaleDataDict`
+ * ``global``: `babel.core.get_global` for every key of the global data
+
+and additionally the memory retained by the data of every locale (including
+the locales it inherits from) and by the data of all locales, where
+`tracemalloc` is available.
+
+The results are printed as a table, or with ``--json`` written as JSON (to
+standard output for ``-``), so that they can be compared across releases.
+Times are in seconds, memory in bytes.
+"""
+
+from optparse import OptionParser
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+# Make sure we're using Babel source, and not some previously installed version
+sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+import babel
+from babel import core, localedata
+from babel.core import Locale
+
+GLOBAL_KEYS = ['zone_aliases', 'zone_territories', 'territory_zones',
+               'meta_zones']
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def _reset():
+    """Empty every cache of the data layer."""
+    localedata.clear_cache()
+    Locale._instances.clear()
+    Locale._parsed.clear()
+    core._global_segments.clear()
+    core._global_data = None
+
+
+def _best(func, repeat, reset=None):
+    """Return the best time of `repeat` calls of `func`, calling `reset`
+    before each of them.
+    """
+    best = None
+    for i in range(repeat):
+        if reset is not None:
+            reset()
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _warm(func, repeat, number=100):
+    """Return the time of a single call of `func` that is already warm."""
+    func()
+    return _best(lambda: [func() for i in range(number)], repeat) / number
+
+
+def _resolve_all(data):
+    if isinstance(data, localedata.LocaleDataDict):
+        for key in data.keys():
+            _resolve_all(data[key])
+
+
+def bench_locale(name, repeat):
+    result = {}
+    result['load_cold'] = _best(lambda: localedata.load(name), repeat,
+                                _reset)
+    result['load_warm'] = _warm(lambda: localedata.load(name), repeat)
+    result['parse_cold'] = _best(lambda: Locale.parse(name), repeat, _reset)
+    result['parse_warm'] = _warm(lambda: Locale.parse(name), repeat)
+    def resolve():
+        _resolve_all(localedata.LocaleDataDict(localedata.load(name)))
+    # cold: data loaded, but no alias resolved yet
+    result['resolve_cold'] = _best(resolve, repeat,
+                                   lambda: localedata.load(name))
+    view = localedata.load_resolved(name)
+    _resolve_all(view)
+    result['resolve_warm'] = _warm(lambda: _resolve_all(view), repeat, 10)
+    if tracemalloc is not None:
+        _reset()
+        gc.collect()
+        tracemalloc.start()
+        data = localedata.load(name)
+        _resolve_all(localedata.load_resolved(name))
+        result['memory'] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+    return result
+
+
+def bench_all(names, repeat):
+    def load_all():
+        for name in names:
+            localedata.load(name)
+    result = {}
+    result['load_cold'] = _best(load_all, repeat, _reset)
+    result['load_warm'] = _warm(load_all, repeat, 1)
+    if tracemalloc is not None:
+        _reset()
+        gc.collect()
+        tracemalloc.start()
+        load_all()
+        result['memory'] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return result
+
+
+def bench_global(repeat):
+    results = {}
+    for key in GLOBAL_KEYS:
+        try:
+            core.get_global(key)
+        except IOError:
+            return None # no global data available
+        results[key] = {
+            'cold': _best(lambda: core.get_global(key), repeat, _reset),
+            'warm': _warm(lambda: core.get_global(key), repeat),
+        }
+    return results
+
+
+def environment():
+    archive = localedata._get_archive()
+    return {
+        'babel': babel.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'storage': archive and 'archive' or 'files',
+        'backend': archive and archive.meta.get('backend', 'pickle') or None,
+        'resolved': bool(archive and archive.meta.get('resolved')),
+    }
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] [locale ...]')
+    parser.add_option('-n', '--repeat', type='int', dest='repeat',
+                      help='number of runs, of which the best one is taken '
+                           '(default %default)')
+    parser.add_option('--json', dest='json', metavar='FILE',
+                      help='write the results as JSON to FILE, or to '
+                           'standard output for "-"')
+    parser.set_defaults(repeat=3)
+    options, args = parser.parse_args()
+
+    names = args or sorted(localedata.locale_identifiers())
+    results = {
+        'environment': environment(),
+        'locales': {},
+    }
+    for name in names:
+        results['locales'][name] = bench_locale(name, options.repeat)
+    results['all'] = bench_all(names, options.repeat)
+    results['global'] = bench_global(options.repeat)
+    _reset()
+
+    if options.json:
+        if options.json == '-':
+            json.dump(results, sys.stdout, indent=2, sort_keys=True)
+            sys.stdout.write('\n')
+        else:
+            fileobj = open(options.json, 'w')
+            try:
+                json.dump(results, fileobj, indent=2, sort_keys=True)
+            finally:
+                fileobj.close()
+        return
+
+    columns = ['load_cold', 'load_warm', 'parse_cold', 'parse_warm',
+               'resolve_cold', 'resolve_warm']
+    print('times in microseconds, memory in KB')
+    print('%-14s %s %10s' % ('locale', ' '.join(['%12s' % column for column
+                                                in columns]), 'memory'))
+    for name in names:
+        result = results['locales'][name]
+        memory = result.get('memory')
+        print('%-14s %s %10s' % (name, ' '.join([
+            '%12.1f' % (result[column] * 1e6) for column in columns
+        ]), memory is not None and '%10.0f' % (memory / 1024.0) or 'n/a'))
+    result = results['all']
+    print('')
+    print('all %d locales: cold load %.3f s, warm load %.3f ms, memory %s' % (
+        len(names), result['load_cold'], result['load_warm'] * 1e3,
+        'memory' in result and '%.1f MB' % (result['memory'] / 1048576.0)
+        or 'n/a'))
+    if results['global'] is None:
+        print('global data: not available')
+    else:
+        for key in GLOBAL_KEYS:
+            result = results['global'][key]
+            print('get_global(%r): cold %.1f us, warm %.2f us' % (
+                key, result['cold'] * 1e6, result['warm'] * 1e6))
+
+
+if __name__ == '__main__':
+    main()
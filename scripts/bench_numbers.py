@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Benchmark for number formatting.
+
+Every case formats the same numbers for the given locale, and the time per
+formatted number is reported. Integers are formatted both on the integer
+path of `NumberPattern` and, passed as `Decimal` objects, on the generic
+path that rounds and splits the digits, which gives the same strings. The
+functions generated by `compile_pattern` are measured for the same pattern.
+"""
+
+from decimal import Decimal
+from optparse import OptionParser
+import os
+import sys
+import time
+
+# Make sure we're using Babel source, and not some previously installed version
+sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+from babel import numbers
+from babel.core import Locale
+
+INTEGERS = [0, 7, -42, 1099, 65536, -1234567, 2 ** 31, 10 ** 12 + 1]
+FLOATS = [0.5, -1.2345, 1099.98, 12345.678, 0.001, 3.14159, 2.5e9, -7.0]
+
+
+def _cases(locale):
+    locale = Locale.parse(locale)
+    pattern = numbers.parse_pattern(locale.decimal_formats.get(None))
+    symbols = numbers._get_symbols(locale)
+    decimals = [Decimal(value) for value in INTEGERS]
+    formatter = numbers.NumberFormatter(locale)
+    compiled = numbers.compile_pattern(pattern, locale)
+    return [
+        ('format_number(int)', INTEGERS,
+         lambda value: numbers.format_number(value, locale=locale)),
+        ('format_number(int as Decimal)', decimals,
+         lambda value: numbers.format_number(value, locale=locale)),
+        ('apply, int path', INTEGERS,
+         lambda value: pattern._apply(value, symbols)),
+        ('apply, generic path', decimals,
+         lambda value: pattern._apply(value, symbols)),
+        ('apply, float', FLOATS,
+         lambda value: pattern._apply(value, symbols)),
+        ('compiled, int', INTEGERS, compiled),
+        ('compiled, int as Decimal', decimals, compiled),
+        ('compiled, float', FLOATS, compiled),
+        ('format_decimal(float)', FLOATS,
+         lambda value: numbers.format_decimal(value, locale=locale)),
+        ('format_currency(float)', FLOATS,
+         lambda value: numbers.format_currency(value, 'EUR',
+                                               locale=locale)),
+        ('NumberFormatter.decimal(int)', INTEGERS, formatter.decimal),
+        ('NumberFormatter.decimal(float)', FLOATS, formatter.decimal),
+    ]
+
+
+def _best(func, values, number, repeat):
+    """Return the best time per call of `func` for the given values."""
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        for j in range(number):
+            for value in values:
+                func(value)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / (number * len(values))
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-l', '--locale', dest='locale',
+                      help='the locale to format for (default %default)')
+    parser.add_option('-n', '--number', type='int', dest='number',
+                      help='number of times the numbers are formatted per '
+                           'run (default %default)')
+    parser.add_option('-r', '--repeat', type='int', dest='repeat',
+                      help='number of runs, of which the best one is taken '
+                           '(default %default)')
+    parser.set_defaults(locale='de_DE', number=2000, repeat=5)
+    options, args = parser.parse_args()
+    if args:
+        parser.error('incorrect number of arguments')
+
+    print('%-32s %12s' % ('case (%s)' % options.locale, 'us per call'))
+    for label, values, func in _cases(options.locale):
+        seconds = _best(func, values, options.number, options.repeat)
+        print('%-32s %12.2f' % (label, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
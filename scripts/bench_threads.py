@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Stress test for loading cached locale data from many threads at once.
+
+Every thread repeatedly loads the data of the same handful of locales, which
+after the first round are all served from the cache. The reported throughput
+should not collapse as the number of threads grows. With ``--locked`` every
+call is additionally serialized through the cache lock, which is how the
+cache used to be read.
+"""
+
+from optparse import OptionParser
+import os
+import sys
+import threading
+import time
+
+# Make sure we're using Babel source, and not some previously installed version
+sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+from babel import localedata
+
+LOCALES = ['en_US', 'de_DE', 'fr_FR', 'ja_JP', 'pt_BR', 'es_ES', 'ru_RU']
+
+
+def run(nthreads, calls, locked=False):
+    load = localedata.load
+    if locked:
+        lock = localedata._cache_lock
+        def load(name, _load=load):
+            lock.acquire()
+            try:
+                return _load(name)
+            finally:
+                lock.release()
+    barrier = threading.Event()
+    def worker():
+        barrier.wait()
+        for i in range(calls // len(LOCALES)):
+            for name in LOCALES:
+                load(name)
+    threads = [threading.Thread(target=worker) for i in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    start = time.time()
+    barrier.set()
+    for thread in threads:
+        thread.join()
+    return time.time() - start
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('-n', '--calls', type='int', dest='calls',
+                      help='number of calls per thread (default %default)')
+    parser.add_option('-t', '--threads', dest='threads',
+                      help='comma-separated thread counts (default %default)')
+    parser.add_option('--locked', action='store_true', dest='locked',
+                      help='serialize all calls through the cache lock')
+    parser.set_defaults(calls=70000, threads='1,2,4,8,16,32,64', locked=False)
+    options, args = parser.parse_args()
+    if args:
+        parser.error('incorrect number of arguments')
+
+    for name in LOCALES:
+        localedata.load(name)
+    print('%8s %12s %14s' % ('threads', 'seconds', 'calls/second'))
+    for nthreads in [int(n) for n in options.threads.split(',')]:
+        elapsed = run(nthreads, options.calls, locked=options.locked)
+        total = nthreads * (options.calls // len(LOCALES)) * len(LOCALES)
+        print('%8d %12.3f %14.0f' % (nthreads, elapsed, total / elapsed))
+
+
+if __name__ == '__main__':
+    main()
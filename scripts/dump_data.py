@@ -35,7 +35,7 @@ def main():
     if len(args) > 1:
         for key in args[1].split('.'):
             data = data[key]
-    if isinstance(data, dict):
+    if hasattr(data, 'items'):
         data = dict(data.items())
     pprint(data)
 
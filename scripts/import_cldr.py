@@ -20,9 +20,10 @@ import sys
 # Make sure we're using Babel source, and not some previously installed version
 sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
 
-from babel import dates, numbers
+from babel import core, dates, numbers
 from babel.compat import pickle, u, text_type, any, ElementTree
 from babel.plural import PluralRule
+from babel import localedata
 from babel.localedata import Alias
 
 parse = ElementTree.parse
@@ -68,6 +69,19 @@ def _translate_alias(ctxt, path):
 
 def main():
     parser = OptionParser(usage='%prog path/to/cldr')
+    parser.add_option('-a', '--archive', action='store_true', dest='archive',
+                      help='also pack the locale data and the global data '
+                           'into archives')
+    parser.add_option('-r', '--resolve-aliases', action='store_true',
+                      dest='resolve_aliases',
+                      help='resolve aliases when packing the archive '
+                           '(implies --archive)')
+    parser.add_option('-b', '--backend', dest='backend',
+                      type='choice', choices=['pickle', 'marshal', 'binary'],
+                      help='encoding of the archive records: pickle, marshal '
+                           'or binary (default %default)')
+    parser.set_defaults(archive=False, resolve_aliases=False,
+                        backend='pickle')
     options, args = parser.parse_args()
     if len(args) != 1:
         parser.error('incorrect number of arguments')
@@ -480,6 +494,17 @@ def main():
         finally:
             outfile.close()
 
+    if options.archive or options.resolve_aliases:
+        sys.stderr.write('Writing global data archive\n')
+        core.build_global_archive(os.path.join(destdir, 'global.arc'),
+                                  os.path.join(destdir, 'global.dat'),
+                                  backend=options.backend)
+        sys.stderr.write('Writing locale data archive\n')
+        localedata.build_archive(os.path.join(destdir, 'localedata.arc'),
+                                 os.path.join(destdir, 'localedata'),
+                                 resolve_aliases=options.resolve_aliases,
+                                 backend=options.backend)
+
 
 if __name__ == '__main__':
     main()
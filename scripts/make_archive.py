@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+from optparse import OptionParser
+import os
+import sys
+
+# Make sure we're using Babel source, and not some previously installed version
+sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+from babel import core, localedata
+from babel.archive import get_backend
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] [path/to/archive]')
+    parser.add_option('-d', '--dirname', dest='dirname',
+                      help='directory containing the .dat files to pack')
+    parser.add_option('-r', '--resolve-aliases', action='store_true',
+                      dest='resolve_aliases',
+                      help='resolve aliases in the locale data at build time')
+    parser.add_option('-g', '--global', action='store_true', dest='global_',
+                      help='split global.dat into an archive instead')
+    parser.add_option('-b', '--backend', dest='backend',
+                      type='choice', choices=['pickle', 'marshal', 'binary'],
+                      help='encoding of the archive records: pickle, marshal '
+                           'or binary (default %default)')
+    parser.add_option('-p', '--protocol', type='int', dest='protocol',
+                      help='pickle protocol to use with the pickle backend '
+                           '(default 2)')
+    parser.set_defaults(resolve_aliases=False, global_=False,
+                        backend='pickle')
+    options, args = parser.parse_args()
+    if len(args) > 1:
+        parser.error('incorrect number of arguments')
+
+    backend_options = {}
+    if options.protocol is not None:
+        if options.backend != 'pickle':
+            parser.error('--protocol requires the pickle backend')
+        backend_options['protocol'] = options.protocol
+    backend = get_backend(options.backend, **backend_options)
+
+    filename = args and args[0] or None
+    if options.global_:
+        datfile = None
+        if options.dirname:
+            datfile = os.path.join(options.dirname, 'global.dat')
+        core.build_global_archive(filename, datfile, backend=backend)
+        return
+    localedata.build_archive(filename, dirname=options.dirname,
+                             resolve_aliases=options.resolve_aliases,
+                             backend=backend)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Report on the memory used by the data of all locales.
+
+The data of every locale is loaded (and with ``--resolve`` also fully alias
+resolved) once with and once without the deduplication of strings, each time
+in a fresh interpreter, and the memory allocated for it is reported together
+with the number of string objects in the data.
+
+The memory is measured with `tracemalloc` where available (Python 3.4 and
+later), and as the growth of the maximum resident set size otherwise.
+"""
+
+from optparse import OptionParser
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+SCRIPT = '''
+import gc, sys
+sys.path.insert(0, %(root)r)
+from babel import localedata
+from babel.compat import text_type
+localedata.set_string_dedup(%(dedup)r)
+names = localedata.locale_identifiers()
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+    import resource
+    start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+else:
+    tracemalloc.start()
+if %(resolve)r:
+    localedata.preload(names)
+else:
+    for name in names:
+        localedata.load(name)
+gc.collect()
+if tracemalloc:
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+else:
+    used = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - start
+
+seen = set()
+strings = {}
+def walk(value):
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    if isinstance(value, text_type):
+        strings[id(value)] = value
+    elif hasattr(value, 'items'):
+        for key, item in value.items():
+            walk(key)
+            walk(item)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            walk(item)
+for name in names:
+    walk(localedata.load(name))
+sys.stdout.write(repr((used, len(strings), len(set(strings.values())))))
+'''
+
+
+def measure(dedup, resolve):
+    process = subprocess.Popen([sys.executable, '-c', SCRIPT % {
+        'root': ROOT, 'dedup': dedup, 'resolve': resolve
+    }], stdout=subprocess.PIPE)
+    output = process.communicate()[0]
+    if process.returncode:
+        raise SystemExit('loading the locale data failed')
+    return eval(output)
+
+
+def main():
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('--resolve', action='store_true', dest='resolve',
+                      help='also resolve all aliases in the loaded data')
+    parser.set_defaults(resolve=False)
+    options, args = parser.parse_args()
+    if args:
+        parser.error('incorrect number of arguments')
+
+    results = []
+    print('%-14s %12s %12s %12s' % ('strings', 'memory (MB)', 'objects',
+                                    'distinct'))
+    for dedup in (False, True):
+        used, objects, distinct = measure(dedup, options.resolve)
+        results.append(used)
+        label = dedup and 'deduplicated' or 'as loaded'
+        print('%-14s %12.1f %12d %12d' % (label, used / 1048576.0, objects,
+                                          distinct))
+    print('saved %.1f MB (%.0f%%)' % ((results[0] - results[1]) / 1048576.0,
+                                      100.0 * (results[0] - results[1]) /
+                                      results[0]))
+
+
+if __name__ == '__main__':
+    main()
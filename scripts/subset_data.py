@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2007-2011 Edgewall Software
+# All rights reserved.
+#
+# This software is licensed as described in the file COPYING, which
+# you should have received as part of this distribution. The terms
+# are also available at http://babel.edgewall.org/wiki/License.
+#
+# This software consists of voluntary contributions made by many
+# individuals. For the exact contribution history, see the revision
+# history and logs, available at http://babel.edgewall.org/log/.
+
+"""Produce a trimmed copy of the Babel data for minimal deployments.
+
+Only the data of the requested locales and the locales they inherit from is
+kept, optionally restricted to some of the top-level sections of the locale
+data and some of the keys of the global data. Sections that are referenced
+by aliases in the kept sections are kept as well.
+
+The output directory has the same layout as the ``babel`` package, so its
+contents can simply replace the ``localedata`` directory and the
+``global.dat`` file (and, with ``--archive``, the ``localedata.arc`` and
+``global.arc`` files) in a deployment bundle.
+
+Example::
+
+  subset_data.py -o build/babel -s numbers,dates -a de_DE de_AT en_US
+"""
+
+from optparse import OptionParser
+import os
+import sys
+
+# Make sure we're using Babel source, and not some previously installed version
+sys.path.insert(0, os.path.join(os.path.dirname(sys.argv[0]), '..'))
+
+from babel import core, localedata
+from babel.compat import pickle
+
+# Named groups of sections, for use with the --sections option
+SECTION_GROUPS = {
+    'numbers': ['number_symbols', 'decimal_formats', 'currency_formats',
+                'percent_formats', 'scientific_formats', 'currency_names',
+                'currency_symbols'],
+    # the time zone names are also used by the long and full time formats
+    # (through the "z" and "v" fields), which fall back to the name of the
+    # territory of the zone
+    'timezones': ['time_zones', 'meta_zones', 'zone_formats', 'territories'],
+    'names': ['languages', 'territories', 'scripts', 'variants'],
+}
+SECTION_GROUPS['dates'] = ['months', 'days', 'quarters', 'eras', 'periods',
+                           'date_formats', 'time_formats', 'datetime_formats',
+                           'week_data'] + SECTION_GROUPS['timezones']
+
+# The keys of the global data used by the functions for each group
+GLOBAL_GROUPS = {
+    'timezones': ['zone_aliases', 'zone_territories', 'territory_zones',
+                  'meta_zones'],
+}
+GLOBAL_GROUPS['dates'] = GLOBAL_GROUPS['timezones']
+
+
+def _read(filename):
+    fileobj = open(filename, 'rb')
+    try:
+        return pickle.load(fileobj)
+    finally:
+        fileobj.close()
+
+
+def _write(filename, data):
+    fileobj = open(filename, 'wb')
+    try:
+        pickle.dump(data, fileobj, 2)
+    finally:
+        fileobj.close()
+
+
+def _alias_targets(value, targets):
+    """Collect the top-level sections the aliases in `value` refer to."""
+    if isinstance(value, localedata.Alias):
+        targets.add(value.keys[0])
+    elif isinstance(value, dict):
+        for item in value.values():
+            _alias_targets(item, targets)
+    elif isinstance(value, tuple):
+        for item in value:
+            _alias_targets(item, targets)
+
+
+def expand_groups(names):
+    """Return the sections of the locale data and the keys of the global
+    data to keep for the given section and group names.
+
+    :return: a ``(sections, global_keys)`` tuple
+    """
+    sections = []
+    global_keys = []
+    for name in names:
+        for section in SECTION_GROUPS.get(name, [name]):
+            if section not in sections:
+                sections.append(section)
+        for key in GLOBAL_GROUPS.get(name, []):
+            if key not in global_keys:
+                global_keys.append(key)
+    return sections, global_keys
+
+
+def subset(destdir, locales, sections=None, global_keys=None, dirname=None):
+    """Write the trimmed data to `destdir`.
+
+    :return: the identifiers of the locales that were written
+    """
+    if dirname is None:
+        dirname = localedata._dirname
+    names = set()
+    for name in locales:
+        while name is not None and name not in names:
+            if not os.path.isfile(os.path.join(dirname, name + '.dat')):
+                raise SystemExit('no locale data for %r' % name)
+            names.add(name)
+            name = localedata._parent(name)
+    data = dict([(name, _read(os.path.join(dirname, name + '.dat')))
+                 for name in names])
+
+    if sections is not None:
+        # keep everything the kept sections refer to through aliases
+        sections = set(sections)
+        while True:
+            targets = set()
+            for name in names:
+                for section in sections:
+                    _alias_targets(data[name].get(section), targets)
+            if targets <= sections:
+                break
+            sections |= targets
+        for name in names:
+            data[name] = dict([(key, value) for key, value
+                               in data[name].items() if key in sections])
+
+    datadir = os.path.join(destdir, 'localedata')
+    if not os.path.isdir(datadir):
+        os.makedirs(datadir)
+    for name in names:
+        _write(os.path.join(datadir, name + '.dat'), data[name])
+
+    globalfile = os.path.join(os.path.dirname(dirname), 'global.dat')
+    if os.path.isfile(globalfile):
+        global_data = _read(globalfile)
+        if global_keys is not None:
+            global_data = dict([(key, value) for key, value
+                                in global_data.items() if key in global_keys])
+        _write(os.path.join(destdir, 'global.dat'), global_data)
+    else:
+        sys.stderr.write('No global data found at %s\n' % globalfile)
+    return sorted(names)
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] locale...')
+    parser.add_option('-o', '--output', dest='destdir',
+                      help='the directory to write the trimmed data to')
+    parser.add_option('-d', '--dirname', dest='dirname',
+                      help='directory containing the per-locale .dat files '
+                           '(default: the localedata directory of Babel)')
+    parser.add_option('-s', '--sections', dest='sections',
+                      help='comma-separated sections of the locale data to '
+                           'keep, or groups of sections: %s (default: all)' %
+                           ', '.join(sorted(SECTION_GROUPS)))
+    parser.add_option('-g', '--global', dest='global_keys',
+                      help='comma-separated keys of the global data to keep '
+                           '(default: the keys used by the kept sections, '
+                           'or all if all sections are kept)')
+    parser.add_option('-a', '--archive', action='store_true', dest='archive',
+                      help='also pack the trimmed data into archives')
+    parser.add_option('-r', '--resolve-aliases', action='store_true',
+                      dest='resolve_aliases',
+                      help='resolve aliases when packing the archive '
+                           '(implies --archive)')
+    parser.add_option('-b', '--backend', dest='backend',
+                      type='choice', choices=['pickle', 'marshal', 'binary'],
+                      help='encoding of the archive records: pickle, marshal '
+                           'or binary (default %default)')
+    parser.set_defaults(archive=False, resolve_aliases=False,
+                        backend='pickle')
+    options, args = parser.parse_args()
+    if not args:
+        parser.error('no locales specified')
+    if not options.destdir:
+        parser.error('no output directory specified')
+
+    sections = global_keys = None
+    if options.sections:
+        sections, global_keys = expand_groups(options.sections.split(','))
+    if options.global_keys:
+        global_keys = options.global_keys.split(',')
+
+    names = subset(options.destdir, args, sections=sections,
+                   global_keys=global_keys, dirname=options.dirname)
+    sys.stderr.write('Wrote %d locales to %s\n' % (len(names),
+                                                   options.destdir))
+
+    if options.archive or options.resolve_aliases:
+        datadir = os.path.join(options.destdir, 'localedata')
+        localedata.build_archive(os.path.join(options.destdir,
+                                              'localedata.arc'),
+                                 datadir,
+                                 resolve_aliases=options.resolve_aliases,
+                                 backend=options.backend)
+        globalfile = os.path.join(options.destdir, 'global.dat')
+        if os.path.isfile(globalfile):
+            core.build_global_archive(os.path.join(options.destdir,
+                                                   'global.arc'), globalfile,
+                                      backend=options.backend)
+
+
+if __name__ == '__main__':
+    main()
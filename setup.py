@@ -13,6 +13,7 @@
 # history and logs, available at http://babel.edgewall.org/log/.
 
 import os
+import re
 try:
     from setuptools import setup
 except ImportError:
@@ -25,10 +26,19 @@ try:
 except ImportError:
     build_doc = test_doc = None
 
+# The version is only defined in the package itself, which is not imported
+# here so that installing does not depend on importing it
+init = open(os.path.join(os.path.dirname(__file__) or '.', 'babel',
+                         '__init__.py'))
+try:
+    version = re.search(r"^__version__ = '([^']+)'", init.read(),
+                        re.MULTILINE).group(1)
+finally:
+    init.close()
 
 setup(
     name = 'Babel',
-    version = '1.0',
+    version = version,
     description = 'Internationalization utilities',
     long_description = \
 """A collection of tools for internationalizing Python applications.""",
@@ -49,7 +59,8 @@ setup(
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
     packages = ['babel', 'babel.messages'],
-    package_data = {'babel': ['global.dat', 'localedata/*.dat']},
+    package_data = {'babel': ['global.dat', 'global.arc', 'localedata.arc',
+                             'localedata/*.dat']},
     test_suite = 'babel.tests.suite',
     tests_require = ['pytz'],
 